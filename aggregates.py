@@ -0,0 +1,74 @@
+import pandas as pd
+
+# Summary Statistics and Key Parameters precomputed for every national/state view.
+
+ALL_STATES = "All States"
+
+def summarize_category(values):
+    """Count and percentage breakdown of a ranking column (missing values are NA)"""
+    valid_values = values.dropna()
+
+    if len(valid_values) == 0:
+        return None
+
+    stats = {}
+    if not pd.api.types.is_numeric_dtype(valid_values):
+        value_counts = valid_values.value_counts()
+        total = len(valid_values)  # Use valid data count, not all data
+
+        stats['counts'] = {}
+        for value, count in value_counts.items():
+            percentage = (count / total) * 100
+            stats['counts'][value] = {
+                'count': int(count),
+                'percentage': round(percentage, 2)
+            }
+    return stats
+
+def summarize_parameters(frame, param_mapping):
+    """Mean of numeric parameters and mode of categorical ones, formatted for display"""
+    parameter_values = {}
+    for param_name, column_name in param_mapping.items():
+        if column_name in frame.columns:
+            # Missing values were normalised to NA at load time
+            valid_values = frame[column_name].dropna()
+
+            if len(valid_values) > 0:
+                if pd.api.types.is_numeric_dtype(valid_values):
+                    # Calculate mean only from valid numeric values
+                    mean_val = valid_values.mean()
+                    if pd.notna(mean_val):
+                        parameter_values[param_name] = f"{mean_val:.2f}"
+                    else:
+                        parameter_values[param_name] = "N/A"
+                else:
+                    # For categorical data, get the most common valid value
+                    mode_values = valid_values.mode()
+                    if len(mode_values) > 0:
+                        parameter_values[param_name] = str(mode_values.iloc[0])
+                    else:
+                        parameter_values[param_name] = "N/A"
+            else:
+                parameter_values[param_name] = "N/A"
+        else:
+            parameter_values[param_name] = "N/A"
+
+    return parameter_values
+
+def build_aggregate_cube(gdf, categories, param_mapping, state_column='NAME_1'):
+    """Precompute statistics per (state, objective) and parameters per state"""
+    views = [(ALL_STATES, gdf)]
+    if state_column in gdf.columns:
+        views.extend((str(state), state_gdf) for state, state_gdf in gdf.groupby(state_column, sort=True))
+
+    statistics = {}
+    parameters = {}
+    for view_name, view_gdf in views:
+        parameters[view_name] = summarize_parameters(view_gdf, param_mapping)
+        for category in categories:
+            if category in view_gdf.columns:
+                statistics[(view_name, category)] = summarize_category(view_gdf[category])
+            else:
+                statistics[(view_name, category)] = None
+
+    return {'statistics': statistics, 'parameters': parameters}
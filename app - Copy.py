@@ -5,39 +5,31 @@ import folium
 from streamlit_folium import st_folium
 from streamlit_folium import folium_static
 import os
-import matplotlib.pyplot as plt
 import numpy as np
 import re
+from data_cleaning import is_valid_value, missing_value_mask
+from parameter_mappings import NATIONAL_PARAMETER_MAPPING, DISTRICT_PARAMETER_MAPPING
+from district_index import build_district_index, lookup_district
+from selection import build_selection_index, select_view
+from filter_metadata import CENTROIDS_PATH, build_filter_metadata, district_frame, district_options, load_district_centroids
+from text_store import build_text_store, get_district_text
+from pie_chart import build_pie_svg
+from data_version import data_version, shapefile_version, version_changed
 
 # Helper for formatting values with units
 def format_value_with_unit(value, unit):
-    if (pd.isna(value) or 
-        value is None or 
-        str(value).strip() in ['', 'XX', 'N/A', 'nan', 'NaN', 'null', 'NULL', '#N/A', '-']):
+    if not is_valid_value(value):
         return "XX"
     
     try:
-        if isinstance(value, (int, float)) and not pd.isna(value):
+        if isinstance(value, (int, float)):
             return f"{value:.1f} {unit}".strip()
         else:
             str_val = str(value).strip()
-            if str_val and str_val not in ['XX', 'N/A', 'nan', 'NaN', 'null', 'NULL', '#N/A', '-']:
-                return f"{str_val} {unit}".strip() if unit else str_val
-            else:
-                return "XX"
+            return f"{str_val} {unit}".strip() if unit else str_val
     except:
         return "XX"
 
-def is_valid_value(value):
-    """Check if a value is valid (not N/A, blank, or other missing indicators)"""
-    if pd.isna(value) or value is None:
-        return False
-    
-    str_val = str(value).strip().lower()
-    invalid_values = ['', 'xx', 'n/a', 'nan', 'null', '#n/a', '-', 'none', 'na']
-    
-    return str_val not in invalid_values
-
 # Import the legend component for colors
 try:
     from updated_legend_component import get_category_colors, get_ranking_color_gradient, get_ranking_order, get_combined_order
@@ -194,9 +186,17 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Cached results are keyed by the content version of the files they were built
+# from (see data_version.py), so they never expire on a timer; max_entries only
+# bounds how many superseded versions are kept around
+LOADER_MAX_ENTRIES = 4
+RESULT_MAX_ENTRIES = 512
+
+TEXT_SOURCES = ['district_text_data.csv', 'District_Param_Values.csv']
+
 # Cache data loading
-@st.cache_data(ttl=3600)
-def load_shapefile(file_path):
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def load_shapefile(file_path, version=None):
     if file_path is None or not os.path.exists(file_path):
         return None
         
@@ -231,93 +231,56 @@ def load_shapefile(file_path):
         st.error(f"Error loading shapefile {file_path}: {e}")
         return None
 
-@st.cache_data(ttl=3600)
-def load_text_data():
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def load_text_data(version=None):
+    """District narratives keyed by normalized (state, district)"""
     try:
-        return pd.read_csv('district_text_data.csv')
+        return build_text_store('district_text_data.csv')
     except:
-        return pd.DataFrame()
+        return {}
 
-@st.cache_data(ttl=3600)
-def get_district_data_cached(gdf_hash, state_name, district_name):
-    """Cached version of district data lookup"""
-    gdf = st.session_state.get('gdf', None)
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def load_district_index(file_path, version=None):
+    """Normalized (state, district) name index for O(1) district lookups"""
+    gdf = load_shapefile(file_path, version)
     if gdf is None:
         return None
-    
-    # Try exact match first
-    district_data = gdf[
-        (gdf["NAME_1"] == state_name) & 
-        (gdf["NAME_2"] == district_name)
-    ]
-    
-    # If no exact match, try case-insensitive match
-    if len(district_data) == 0:
-        district_data = gdf[
-            (gdf["NAME_1"].str.lower() == state_name.lower()) & 
-            (gdf["NAME_2"].str.lower() == district_name.lower())
-        ]
-    
-    # If still no match, try partial match
-    if len(district_data) == 0:
-        district_data = gdf[
-            (gdf["NAME_1"].str.contains(state_name, case=False, na=False)) & 
-            (gdf["NAME_2"].str.contains(district_name, case=False, na=False))
-        ]
-    
-    if len(district_data) == 0:
+    return build_district_index(gdf)
+
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def load_selection_index(file_path, version=None):
+    """Row positions of every state and district, for filtered views that don't copy the layer"""
+    gdf = load_shapefile(file_path, version)
+    if gdf is None:
         return None
-    
-    return district_data.iloc[0]
+    return build_selection_index(gdf)
 
-@st.cache_data(ttl=3600)
-def get_text_data_cached(text_data_hash, district_name):
-    """Cached version of text data lookup"""
-    text_data = st.session_state.get('text_data', pd.DataFrame())
-    if text_data.empty:
-        return {}
-    
-    district_text = text_data[text_data['District'] == district_name]
-    if len(district_text) > 0:
-        return district_text.iloc[0].to_dict()
-    return {}
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def load_filter_metadata(file_path, version=None, centroids_version=None):
+    """Dropdown options and the framing table of every state and district"""
+    gdf = load_shapefile(file_path, version)
+    if gdf is None:
+        return None
+    return build_filter_metadata(gdf, centroids=load_district_centroids(CENTROIDS_PATH))
 
-# Parameter mappings for National/State level (exact column names from shapefile)
-NATIONAL_PARAMETER_MAPPING = {
-    "Solar Irradiance": "2Solar_Irr",
-    "Cropping Intensity(%)": "2CropInten", 
-    "Irrigation Intensity (%)": "2IrriInten",
-    "IWU (% of CWU)": "2IWU_CWU",
-    "Elect(%)": "2Elect",
-    "GW_dev_stage (%)": "2GW_dev",
-    "Surface water area (km2)-%": "2SWArea",
-    "Cultivated land (%)": "2Cul-Land",
-    "Electricity Subsidy": "2El.Subsid",  # Fixed: exact name from shapefile
-    "GW share irr (% of IWU)": "2GW_share",
-    "WL (m)": "2WL_m",
-    "Small& Marginal % Holdings": "2S_M_Holds"
-}
+@st.cache_data(max_entries=RESULT_MAX_ENTRIES)
+def get_district_data_cached(_gdf, _district_index, gdf_version, state_name, district_name):
+    """Cached version of district data lookup: (row, candidates), the row None unless one district matches"""
+    gdf, district_index = _gdf, _district_index
+    if gdf is None or district_index is None:
+        return None, []
+    
+    # Hash hit on normalized names; ambiguous partial matches return no row, only the candidates
+    row_label, candidates = lookup_district(district_index, state_name, district_name)
+    if row_label is None:
+        return None, candidates
+    
+    return gdf.loc[row_label], candidates
 
-# Parameter mappings for District level (exact column names from shapefile)
-DISTRICT_PARAMETER_MAPPING = {
-    "Cultivated land (%)": "1Cult_land",  # Fixed: was 1Cult_land1
-    "Cropping Intensity(%)": "1Crop_Int",
-    "Irrigation Coverage (%)": "1Irrig_Int",  # Fixed: was 1Irrig_Inte
-    "Irrigation Water Requirement (% of CWU)": "1IWU",
-    "GW irrigation (%)": "1GW_Irr_Sh",
-    "GW development (%)": "1GW_Dev",
-    "SW bodies (#)": "1no_of_SWB",
-    "SW bodies (% of district area)": "1SW_body",
-    "Electric pumps (%)": "1ElectPtg",
-    "Diesel pumps (%)": "1DieselPtg",
-    "Electricity Tariff (paisa/kWH)": "1el_Tariff",
-    "Small& Marginal Holdings (%)": "1S_M_Hold",
-    "Avg. farmer area (ha)": "1ALLGrps",
-    "Avg. number of parcels": "1ALLGrpsNo",
-    "DISCOM Name": "1DISCOMNam",
-    "DISCOM Rating": "1DISCOMRat",
-    "Feeder segregation": "1Feederseg"
-}
+@st.cache_data(max_entries=RESULT_MAX_ENTRIES)
+def get_text_data_cached(_text_data, text_version, state_name, district_name):
+    """Cached version of text data lookup"""
+    return dict(get_district_text(_text_data or {}, state_name, district_name))
 
 categories = {
     "Adapt": "Adaptation",
@@ -347,7 +310,7 @@ def calculate_statistics(gdf, category):
     
     stats = {}
     # Filter out invalid values before calculating statistics
-    valid_data = gdf[gdf[category].apply(is_valid_value)]
+    valid_data = gdf[~missing_value_mask(gdf[category])]
     
     if len(valid_data) == 0:
         return None
@@ -366,36 +329,23 @@ def calculate_statistics(gdf, category):
                 }
     return stats
 
-def get_district_details(gdf, state_name, district_name):
-    """Get detailed information for a specific district with better matching"""
+def get_district_details(gdf, state_name, district_name, district_index):
+    """Get detailed information for a specific district from the prebuilt name index"""
     if state_name == "All States" or district_name == "All Districts":
         return None
     
-    # Try exact match first
-    district_data = gdf[
-        (gdf["NAME_1"] == state_name) & 
-        (gdf["NAME_2"] == district_name)
-    ]
+    row_label, candidates = lookup_district(district_index, state_name, district_name)
     
-    # If no exact match, try case-insensitive match
-    if len(district_data) == 0:
-        district_data = gdf[
-            (gdf["NAME_1"].str.lower() == state_name.lower()) & 
-            (gdf["NAME_2"].str.lower() == district_name.lower())
-        ]
-    
-    # If still no match, try partial match
-    if len(district_data) == 0:
-        district_data = gdf[
-            (gdf["NAME_1"].str.contains(state_name, case=False, na=False)) & 
-            (gdf["NAME_2"].str.contains(district_name, case=False, na=False))
-        ]
-    
-    if len(district_data) == 0:
-        st.warning(f"No data found for {district_name}, {state_name}")
+    if row_label is None:
+        if candidates:
+            # Several partial matches - list them (best first) instead of guessing
+            matches = "; ".join(f"{district}, {state}" for _, state, district, _ in candidates)
+            st.warning(f"Several districts match {district_name}, {state_name}: {matches}")
+        else:
+            st.warning(f"No data found for {district_name}, {state_name}")
         return None
     
-    return district_data.iloc[0]
+    return gdf.loc[row_label]
 
 def render_district_dashboard(district_data, selected_category, district_text_dict):
     """Render detailed district-level dashboard with all categories side by side"""
@@ -426,17 +376,14 @@ def render_district_dashboard(district_data, selected_category, district_text_di
         
         if gdf is not None:
             try:
-                district_gdf = gdf[(gdf['NAME_1'] == state_name) & (gdf['NAME_2'] == district_name)]
+                district_gdf = select_view(gdf, st.session_state['selection_index'], state_name, district_name)
+                # Center and extent from the framing table
+                frame = district_frame(st.session_state['filter_metadata'], state_name, district_name)
                 
-                if not district_gdf.empty:
-                    # Use bounds for quick centering instead of complex centroid calculation
-                    bounds = district_gdf.geometry.bounds.iloc[0]
-                    center_lat = (bounds['miny'] + bounds['maxy']) / 2
-                    center_lon = (bounds['minx'] + bounds['maxx']) / 2
-                    
+                if not district_gdf.empty and frame is not None:
                     # Create simplified map
                     m = folium.Map(
-                        location=[center_lat, center_lon],
+                        location=frame['center'],
                         zoom_start=11,
                         tiles="CartoDB dark_matter",
                         width='100%',
@@ -456,10 +403,8 @@ def render_district_dashboard(district_data, selected_category, district_text_di
                     ).add_to(m)
                     
                     # Fit bounds to show the full district
-                    district_bounds = district_gdf_wgs84.geometry.bounds.iloc[0]
-                    southwest = [district_bounds['miny'], district_bounds['minx']]
-                    northeast = [district_bounds['maxy'], district_bounds['maxx']]
-                    m.fit_bounds([southwest, northeast], padding=[10, 10])
+                    min_x, min_y, max_x, max_y = frame['fit_bounds']
+                    m.fit_bounds([[min_y, min_x], [max_y, max_x]], padding=[10, 10])
                     
                     # Use st_folium with minimal options for speed
                     st_folium(m, height=300, width=None, returned_objects=[])
@@ -633,7 +578,7 @@ def render_district_dashboard(district_data, selected_category, district_text_di
             """, unsafe_allow_html=True)
 
 def get_parameter_values(gdf, selected_state, selected_district, param_mapping):
-    filtered_data = gdf.copy()
+    filtered_data = gdf
     
     if selected_state != "All States":
         filtered_data = filtered_data[filtered_data["NAME_1"] == selected_state]
@@ -645,7 +590,7 @@ def get_parameter_values(gdf, selected_state, selected_district, param_mapping):
     for param_name, column_name in param_mapping.items():
         if column_name in filtered_data.columns:
             # Filter out invalid values first, then calculate
-            valid_mask = filtered_data[column_name].apply(is_valid_value)
+            valid_mask = ~missing_value_mask(filtered_data[column_name])
             valid_data = filtered_data[column_name][valid_mask]
             
             if len(valid_data) > 0:
@@ -672,8 +617,9 @@ def get_parameter_values(gdf, selected_state, selected_district, param_mapping):
     
     return parameter_values
 
-def render_national_state_dashboard(filtered_gdf, selected_category, selected_state, gdf_hash):
+def render_national_state_dashboard(gdf, filtered_gdf, selected_category, selected_state, state_boundary_gdf, versions):
     """Render the national/state level dashboard with caching"""
+    selection_index = st.session_state['selection_index']
     
     # Main content - 3 columns layout
     map_col, stats_col, params_col = st.columns([2, 1, 1])
@@ -684,7 +630,7 @@ def render_national_state_dashboard(filtered_gdf, selected_category, selected_st
         
         if not filtered_gdf.empty:
             # Use cached map data preparation
-            map_data = get_map_data_cached(gdf_hash, selected_state)
+            map_data = get_map_data_cached(gdf, selection_index, versions['gdf'], selected_state)
             
             if map_data:
                 # Create map with cached data
@@ -717,7 +663,7 @@ def render_national_state_dashboard(filtered_gdf, selected_category, selected_st
                 folium.GeoJson(map_data['geometry'], style_function=style_function).add_to(m)
                 
                 # Add cached state boundary overlay with white boundaries ON TOP
-                state_boundary_data = get_state_boundary_cached()
+                state_boundary_data = get_state_boundary_cached(state_boundary_gdf, versions['state_boundary'])
                 if state_boundary_data is not None:
                     folium.GeoJson(
                         state_boundary_data,
@@ -741,7 +687,7 @@ def render_national_state_dashboard(filtered_gdf, selected_category, selected_st
         st.markdown('<div class="section-header">📊 Legend</div>', unsafe_allow_html=True)
         
         # Use cached statistics calculation
-        stats = calculate_statistics_cached(gdf_hash, selected_state, "All Districts", selected_category)
+        stats = calculate_statistics_cached(gdf, selection_index, versions['gdf'], selected_state, "All Districts", selected_category)
         
         if stats and 'counts' in stats:
             levels = list(stats['counts'].keys())
@@ -789,39 +735,19 @@ def render_national_state_dashboard(filtered_gdf, selected_category, selected_st
             
             # Compact pie chart - only create if reasonable number of categories
             if len(ordered_levels) <= 6:
-                try:
-                    fig, ax = plt.subplots(figsize=(3.5, 3.5))
-                    pie_colors = []
-                    pie_percentages = []
-                    for level in ordered_levels:
-                        pie_percentages.append(stats['counts'][level]['percentage'])
-                        if level in category_colors:
-                            pie_colors.append(category_colors[level])
-                        elif level in ranking_colors:
-                            pie_colors.append(ranking_colors[level])
-                        else:
-                            pie_colors.append('#757575')
-                    
-                    wedges, texts, autotexts = ax.pie(
-                        pie_percentages, 
-                        colors=pie_colors,
-                        autopct='%1.1f%%',
-                        startangle=90,
-                        textprops={'fontsize': 8}
-                    )
-                    fig.patch.set_facecolor('#2C3E50')
-                    ax.set_facecolor('#2C3E50')
-                    for autotext in autotexts:
-                        autotext.set_color('white')
-                        autotext.set_fontweight('bold')
-                        autotext.set_fontsize(8)
-                    for text in texts:
-                        text.set_fontsize(0)  # Hide labels to save space
-                    plt.tight_layout()
-                    st.pyplot(fig)
-                    plt.close()
-                except Exception as chart_error:
-                    st.write("Chart could not be rendered")
+                pie_colors = []
+                pie_percentages = []
+                for level in ordered_levels:
+                    pie_percentages.append(stats['counts'][level]['percentage'])
+                    if level in category_colors:
+                        pie_colors.append(category_colors[level])
+                    elif level in ranking_colors:
+                        pie_colors.append(ranking_colors[level])
+                    else:
+                        pie_colors.append('#757575')
+                
+                # Inline SVG, memoized on the view's percentages and colors
+                st.markdown(build_pie_svg(tuple(pie_percentages), tuple(pie_colors)), unsafe_allow_html=True)
         else:
             st.markdown('<div class="metric-container"><span class="metric-name">No statistics available</span></div>', unsafe_allow_html=True)
     
@@ -830,8 +756,8 @@ def render_national_state_dashboard(filtered_gdf, selected_category, selected_st
         st.markdown('<div class="section-header">📋 Key Parameters</div>', unsafe_allow_html=True)
         
         # Use cached parameter calculation
-        param_mapping_str = str(NATIONAL_PARAMETER_MAPPING)
-        parameter_values = get_parameter_values_cached(gdf_hash, selected_state, "All Districts", param_mapping_str)
+        param_items = tuple(NATIONAL_PARAMETER_MAPPING.items())
+        parameter_values = get_parameter_values_cached(gdf, selection_index, versions['gdf'], selected_state, "All Districts", param_items)
         
         for param_name, value in parameter_values.items():
             # Get icon
@@ -856,23 +782,19 @@ def render_national_state_dashboard(filtered_gdf, selected_category, selected_st
             </div>
             """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=3600)
-def calculate_statistics_cached(gdf_hash, selected_state, selected_district, category):
+@st.cache_data(max_entries=RESULT_MAX_ENTRIES)
+def calculate_statistics_cached(_gdf, _selection, gdf_version, selected_state, selected_district, category):
     """Cached version of statistics calculation"""
-    gdf = st.session_state.get('gdf', None)
+    gdf = _gdf
     if gdf is None or category not in gdf.columns:
         return None
     
     # Apply filters
-    filtered_data = gdf.copy()
-    if selected_state != "All States":
-        filtered_data = filtered_data[filtered_data["NAME_1"] == selected_state]
-    if selected_district != "All Districts":
-        filtered_data = filtered_data[filtered_data["NAME_2"] == selected_district]
+    filtered_data = select_view(gdf, _selection, selected_state, selected_district)
     
     stats = {}
     # Filter out invalid values before calculating statistics
-    valid_data = filtered_data[filtered_data[category].apply(is_valid_value)]
+    valid_data = filtered_data[~missing_value_mask(filtered_data[category])]
     
     if len(valid_data) == 0:
         return None
@@ -891,27 +813,23 @@ def calculate_statistics_cached(gdf_hash, selected_state, selected_district, cat
                 }
     return stats
 
-@st.cache_data(ttl=3600)
-def get_parameter_values_cached(gdf_hash, selected_state, selected_district, param_mapping_str):
+@st.cache_data(max_entries=RESULT_MAX_ENTRIES)
+def get_parameter_values_cached(_gdf, _selection, gdf_version, selected_state, selected_district, param_items):
     """Cached version of parameter values calculation"""
-    gdf = st.session_state.get('gdf', None)
+    gdf = _gdf
     if gdf is None:
         return {}
     
-    # Reconstruct param_mapping from string (since dicts aren't hashable)
-    param_mapping = eval(param_mapping_str)
+    # The mapping is passed as (name, column) pairs since dicts aren't hashable
+    param_mapping = dict(param_items)
     
-    filtered_data = gdf.copy()
-    if selected_state != "All States":
-        filtered_data = filtered_data[filtered_data["NAME_1"] == selected_state]
-    if selected_district != "All Districts":
-        filtered_data = filtered_data[filtered_data["NAME_2"] == selected_district]
+    filtered_data = select_view(gdf, _selection, selected_state, selected_district)
     
     parameter_values = {}
     for param_name, column_name in param_mapping.items():
         if column_name in filtered_data.columns:
             # Filter out invalid values first, then calculate
-            valid_mask = filtered_data[column_name].apply(is_valid_value)
+            valid_mask = ~missing_value_mask(filtered_data[column_name])
             valid_data = filtered_data[column_name][valid_mask]
             
             if len(valid_data) > 0:
@@ -938,10 +856,10 @@ def get_parameter_values_cached(gdf_hash, selected_state, selected_district, par
     
     return parameter_values
 
-@st.cache_data(ttl=3600)
-def get_state_boundary_cached():
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def get_state_boundary_cached(_state_boundary_gdf, boundary_version):
     """Cache the state boundary processing"""
-    state_boundary_gdf = st.session_state.get('state_boundary_gdf', None)
+    state_boundary_gdf = _state_boundary_gdf
     if state_boundary_gdf is not None:
         try:
             # Convert to WGS84 and simplify geometry for performance
@@ -953,17 +871,15 @@ def get_state_boundary_cached():
             return None
     return None
 
-@st.cache_data(ttl=3600)
-def get_map_data_cached(gdf_hash, selected_state):
+@st.cache_data(max_entries=RESULT_MAX_ENTRIES)
+def get_map_data_cached(_gdf, _selection, gdf_version, selected_state):
     """Cache only the map data preparation, not the folium object"""
-    gdf = st.session_state.get('gdf', None)
+    gdf = _gdf
     if gdf is None:
         return None
     
     # Apply state filter
-    filtered_gdf = gdf.copy()
-    if selected_state != "All States":
-        filtered_gdf = filtered_gdf[filtered_gdf["NAME_1"] == selected_state]
+    filtered_gdf = select_view(gdf, _selection, selected_state, "All Districts")
     
     if filtered_gdf.empty:
         return None
@@ -992,8 +908,7 @@ def get_map_data_cached(gdf_hash, selected_state):
         zoom_level = 4
     
     # Simplify geometry for faster rendering
-    filtered_gdf_simplified = filtered_gdf.copy()
-    filtered_gdf_simplified.geometry = filtered_gdf_simplified.geometry.simplify(0.005, preserve_topology=False)
+    filtered_gdf_simplified = filtered_gdf.set_geometry(filtered_gdf.geometry.simplify(0.005, preserve_topology=False))
     
     # Return map parameters and simplified geometry
     return {
@@ -1034,6 +949,18 @@ def extract_discom_acronym(discom_name):
     
     return discom_str
 
+def invalidate_stale_caches(versions):
+    """Drop cached results built from data that has since changed on disk"""
+    if version_changed('gdf', versions['gdf']):
+        for cached in (get_district_data_cached, calculate_statistics_cached, get_parameter_values_cached,
+                       get_map_data_cached, load_district_index, load_selection_index,
+                       load_filter_metadata):
+            cached.clear()
+    if version_changed('state_boundary', versions['state_boundary']):
+        get_state_boundary_cached.clear()
+    if version_changed('text', versions['text']):
+        get_text_data_cached.clear()
+
 # Main app logic
 def main():
     # Function to find shapefiles in current directory and subdirectories
@@ -1088,26 +1015,38 @@ def main():
     ]
     
     state_boundary_gdf = None
+    boundary_version = None
     
     for path in state_boundary_paths:
         if os.path.exists(path):
-            state_boundary_gdf = load_shapefile(path)
+            boundary_version = shapefile_version(path)
+            state_boundary_gdf = load_shapefile(path, boundary_version)
             if state_boundary_gdf is not None:
                 break
     
+    # Content versions of every data source; they are part of each cache key
+    versions = {
+        'gdf': shapefile_version(shapefile_path),
+        'state_boundary': boundary_version,
+        'text': data_version(TEXT_SOURCES),
+        'centroids': data_version([CENTROIDS_PATH])
+    }
+    invalidate_stale_caches(versions)
+    
     # Load main shapefile
-    gdf = load_shapefile(shapefile_path) if shapefile_path else None
-    text_data = load_text_data()
+    gdf = load_shapefile(shapefile_path, versions['gdf']) if shapefile_path else None
+    text_data = load_text_data(versions['text'])
 
     if gdf is not None:
         # Store GeoDataFrame in session state for use in district view
         st.session_state['gdf'] = gdf
         st.session_state['state_boundary_gdf'] = state_boundary_gdf
         st.session_state['text_data'] = text_data
-        
-        # Create hash for caching (use a simple string hash)
-        gdf_hash = str(hash(str(gdf.shape) + str(gdf.columns.tolist())))
-        text_hash = str(hash(str(text_data.shape) + str(text_data.columns.tolist()))) if not text_data.empty else "empty"
+        district_index = load_district_index(shapefile_path, versions['gdf'])
+        st.session_state['district_index'] = district_index
+        st.session_state['selection_index'] = load_selection_index(shapefile_path, versions['gdf'])
+        filter_metadata = load_filter_metadata(shapefile_path, versions['gdf'], versions['centroids'])
+        st.session_state['filter_metadata'] = filter_metadata
         
         # Dashboard header
         st.markdown('<h1 class="dashboard-title">🌞 Solar Suitability Dashboard</h1>', unsafe_allow_html=True)
@@ -1118,23 +1057,12 @@ def main():
         
         with col1:
             st.markdown("**🌍 State**")
-            states = ["All States"]
-            if "NAME_1" in gdf.columns:
-                valid_states = [str(s) for s in gdf["NAME_1"].unique() if s is not None and str(s) != "nan"]
-                states.extend(sorted(valid_states))
+            states = ["All States"] + filter_metadata['states']
             selected_state = st.selectbox("State", states, label_visibility="collapsed")
         
         with col2:
             st.markdown("**🏘️ District**")
-            if selected_state != "All States":
-                state_filtered = gdf[gdf["NAME_1"] == selected_state]
-            else:
-                state_filtered = gdf
-            
-            districts = ["All Districts"]
-            if "NAME_2" in gdf.columns:
-                valid_districts = [str(d) for d in state_filtered["NAME_2"].unique() if d is not None and str(d) != "nan"]
-                districts.extend(sorted(valid_districts))
+            districts = ["All Districts"] + district_options(filter_metadata, selected_state)
             selected_district = st.selectbox("District", districts, label_visibility="collapsed")
         
         with col3:
@@ -1149,27 +1077,26 @@ def main():
         
         st.markdown('</div>', unsafe_allow_html=True)
         
-        # Apply filters
-        filtered_gdf = gdf.copy()
-        if selected_state != "All States":
-            filtered_gdf = filtered_gdf[filtered_gdf["NAME_1"] == selected_state]
-        if selected_district != "All Districts":
-            filtered_gdf = filtered_gdf[filtered_gdf["NAME_2"] == selected_district]
+        # Apply filters - a positional view of the loaded layer, not a copy
+        filtered_gdf = select_view(gdf, st.session_state['selection_index'], selected_state, selected_district)
         
         # Check if showing district-level detail
         show_district_dashboard = (selected_state != "All States" and selected_district != "All Districts")
         
         if show_district_dashboard:
             # Show detailed district dashboard with cached data
-            district_data = get_district_data_cached(gdf_hash, selected_state, selected_district)
+            district_data, candidates = get_district_data_cached(gdf, district_index, versions['gdf'], selected_state, selected_district)
             if district_data is not None:
-                district_text_dict = get_text_data_cached(text_hash, selected_district)
+                district_text_dict = get_text_data_cached(text_data, versions['text'], selected_state, selected_district)
                 render_district_dashboard(district_data, selected_category, district_text_dict)
+            elif candidates:
+                matches = "; ".join(f"{district}, {state}" for _, state, district, _ in candidates)
+                st.warning(f"Several districts match {selected_district}, {selected_state}: {matches}")
             else:
                 st.error("District data not found")
         else:
             # Show original national/state level dashboard
-            render_national_state_dashboard(filtered_gdf, selected_category, selected_state, gdf_hash)
+            render_national_state_dashboard(gdf, filtered_gdf, selected_category, selected_state, state_boundary_gdf, versions)
     else:
         st.error("Could not load main shapefile. Please check file availability.")
         
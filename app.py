@@ -5,38 +5,42 @@ import folium
 from streamlit_folium import st_folium
 from streamlit_folium import folium_static
 import os
-import matplotlib.pyplot as plt
+import json
 import numpy as np
+from data_bundle import SOURCE_COMPONENTS, load_bundle, load_layer_pyramid, simplify_layer
+from data_cleaning import is_valid_value, normalize_missing_values
+from parameter_mappings import NATIONAL_PARAMETER_MAPPING, DISTRICT_PARAMETER_MAPPING
+from aggregates import build_aggregate_cube, summarize_category, summarize_parameters
+import vector_tiles
+from map_payload import build_class_codes, build_map_payload, mapped_rows, view_zoom_level
+from leaflet_map import (build_color_tables, publish_boundary_data, publish_view_data, published_url,
+                         render_leaflet_map)
+from warmup import get_view_store_path, load_view_store
+from state_boundaries import build_boundary_overlay, get_state_overlay
+from geometry_pyramid import select_level
+from district_index import build_district_index, lookup_district
+from selection import build_selection_index, select_view
+from spatial_index import build_spatial_index, lookup_points
+from filter_metadata import CENTROIDS_PATH, build_filter_metadata, district_frame, district_options, load_district_centroids, view_frame
+from text_store import build_text_store, get_district_text
+from pie_chart import build_pie_svg
+from shared_geodata import attach_shared_layer, get_shared_cache_dir
+import data_watcher
 
 # Helper for formatting values with units
 def format_value_with_unit(value, unit):
-    if (pd.isna(value) or 
-        value is None or 
-        str(value).strip() in ['', 'XX', 'N/A', 'nan', 'NaN', 'null', 'NULL', '#N/A', '-']):
+    if not is_valid_value(value):
         return "XX"
     
     try:
-        if isinstance(value, (int, float)) and not pd.isna(value):
+        if isinstance(value, (int, float)):
             return f"{value:.1f} {unit}".strip()
         else:
             str_val = str(value).strip()
-            if str_val and str_val not in ['XX', 'N/A', 'nan', 'NaN', 'null', 'NULL', '#N/A', '-']:
-                return f"{str_val} {unit}".strip() if unit else str_val
-            else:
-                return "XX"
+            return f"{str_val} {unit}".strip() if unit else str_val
     except:
         return "XX"
 
-def is_valid_value(value):
-    """Check if a value is valid (not N/A, blank, or other missing indicators)"""
-    if pd.isna(value) or value is None:
-        return False
-    
-    str_val = str(value).strip().lower()
-    invalid_values = ['', 'xx', 'n/a', 'nan', 'null', '#n/a', '-', 'none', 'na']
-    
-    return str_val not in invalid_values
-
 # Import the legend component for colors
 try:
     from updated_legend_component import get_category_colors, get_ranking_color_gradient
@@ -186,9 +190,32 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Cached loaders take the content version of their source files (published by
+# data_watcher.py) as part of the key instead of expiring on a timer, so a data
+# update only replaces the caches that depend on the files that changed
+LOADER_MAX_ENTRIES = 4
+RESULT_MAX_ENTRIES = 512
+
+TEXT_SOURCES = ['district_text_data.csv', 'District_Param_Values.csv']
+
 # Cache data loading
-@st.cache_data(ttl=3600)
-def load_shapefile(file_path):
+def load_shapefile(file_path, version=None):
+    # With SOLAR_SHARED_CACHE_DIR set, every session and worker maps one host-wide copy
+    if get_shared_cache_dir() and file_path is not None and os.path.exists(file_path):
+        try:
+            shared_gdf = attach_shared_shapefile(file_path, version)
+        except Exception:
+            shared_gdf = None
+        if shared_gdf is not None:
+            return shared_gdf
+    return load_shapefile_copy(file_path, version)
+
+@st.cache_resource(max_entries=LOADER_MAX_ENTRIES)
+def attach_shared_shapefile(file_path, version=None):
+    return attach_shared_layer(file_path)
+
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def load_shapefile_copy(file_path, version=None):
     if file_path is None or not os.path.exists(file_path):
         return None
         
@@ -205,7 +232,15 @@ def load_shapefile(file_path):
         if missing_files:
             st.warning(f"Missing shapefile components: {', '.join(missing_files)}")
             return None
-        
+
+        # Prefer the precompiled columnar bundle (built by data_bundle.py) when it is current
+        try:
+            bundled_gdf = load_bundle(file_path)
+        except Exception:
+            bundled_gdf = None
+        if bundled_gdf is not None:
+            return bundled_gdf
+
         # Set GDAL environment variable to restore missing .shx files if possible
         import geopandas as gpd
         import os as gdal_os
@@ -213,9 +248,11 @@ def load_shapefile(file_path):
         
         gdf = gpd.read_file(file_path)
         
-        # Simplify geometry for better performance if dataset is large
-        if len(gdf) > 100:
-            gdf.geometry = gdf.geometry.simplify(0.001, preserve_topology=False)
+        # Convert XX/N/A/-/#N/A sentinels to NA once, as typed nullable columns
+        gdf = normalize_missing_values(gdf)
+        
+        # Simplify geometry for better performance if dataset is large (shared borders kept intact)
+        gdf, _ = simplify_layer(gdf)
         
         return gdf
         
@@ -223,49 +260,13 @@ def load_shapefile(file_path):
         st.error(f"Error loading shapefile {file_path}: {e}")
         return None
 
-@st.cache_data(ttl=3600)
-def load_text_data():
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def load_text_data(version=None):
+    """District narratives keyed by normalized (state, district)"""
     try:
-        return pd.read_csv('district_text_data.csv')
+        return build_text_store(*TEXT_SOURCES)
     except:
-        return pd.DataFrame()
-
-# Parameter mappings for National/State level (exact column names from shapefile)
-NATIONAL_PARAMETER_MAPPING = {
-    "Solar Irradiance": "2Solar_Irr",
-    "Cropping Intensity(%)": "2CropInten", 
-    "Irrigation Intensity (%)": "2IrriInten",
-    "IWU (% of CWU)": "2IWU_CWU",
-    "Elect(%)": "2Elect",
-    "GW_dev_stage (%)": "2GW_dev",
-    "Surface water area (km2)-%": "2SWArea",
-    "Cultivated land (%)": "2Cul-Land",
-    "Electricity Subsidy": "2El.Subsid",  # Fixed: exact name from shapefile
-    "GW share irr (% of IWU)": "2GW_share",
-    "WL (m)": "2WL_m",
-    "Small& Marginal % Holdings": "2S_M_Holds"
-}
-
-# Parameter mappings for District level (exact column names from shapefile)
-DISTRICT_PARAMETER_MAPPING = {
-    "Cultivated land (%)": "1Cult_land",  # Fixed: was 1Cult_land1
-    "Cropping Intensity(%)": "1Crop_Int",
-    "Irrigation Coverage (%)": "1Irrig_Int",  # Fixed: was 1Irrig_Inte
-    "Irrigation Water Requirement (% of CWU)": "1IWU",
-    "GW irrigation (%)": "1GW_Irr_Sh",
-    "GW development (%)": "1GW_Dev",
-    "SW bodies (#)": "1no_of_SWB",
-    "SW bodies (% of district area)": "1SW_body",
-    "Electric pumps (%)": "1ElectPtg",
-    "Diesel pumps (%)": "1DieselPtg",
-    "Electricity Tariff (paisa/kWH)": "1el_Tariff",
-    "Small& Marginal Holdings (%)": "1S_M_Hold",
-    "Avg. farmer area (ha)": "1ALLGrps",
-    "Avg. number of parcels": "1ALLGrpsNo",
-    "DISCOM Name": "1DISCOMNam",
-    "DISCOM Rating": "1DISCOMRat",
-    "Feeder segregation": "1Feederseg"
-}
+        return {}
 
 categories = {
     "Adapt": "Adaptation",
@@ -274,6 +275,149 @@ categories = {
     "General_SI": "General SI"
 }
 
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def load_aggregate_cube(file_path, version=None):
+    """Precompute Summary Statistics and Key Parameters for every state view"""
+    gdf = load_shapefile(file_path, version)
+    if gdf is None:
+        return None
+    cube = build_aggregate_cube(gdf, list(categories.keys()), NATIONAL_PARAMETER_MAPPING)
+    
+    # Prefer the views pre-rendered by warmup.py (map payloads and their statistics)
+    cube['views'] = load_warm_views(file_path, version) or {}
+    for view_key, warm_view in cube['views'].items():
+        cube['statistics'][view_key] = warm_view['statistics']
+    return cube
+
+@st.cache_resource(max_entries=LOADER_MAX_ENTRIES)
+def start_vector_tiles(file_path, state_boundary_path, version=None, state_boundary_version=None):
+    """Publish (or republish, for new data versions) the district and state layers on the local vector tile server"""
+    if not vector_tiles.is_available():
+        return None
+    
+    gdf = load_shapefile(file_path, version)
+    if gdf is None:
+        return None
+    
+    try:
+        tile_base_url = vector_tiles.start_tile_server()
+    except OSError:
+        # Port already taken (e.g. another worker on this host) - fall back to GeoJSON
+        return None
+    
+    vector_tiles.register_layer(
+        'districts', gdf, ["NAME_1", "NAME_2"] + list(categories.keys()), version,
+        filter_column="NAME_1", pyramid=load_geometry_pyramid(file_path, version)
+    )
+    state_boundary_gdf = load_shapefile(state_boundary_path, state_boundary_version) if state_boundary_path else None
+    if state_boundary_gdf is not None:
+        vector_tiles.register_layer('states', state_boundary_gdf, [], state_boundary_version)
+    
+    return tile_base_url
+
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def load_boundary_overlay(state_boundary_path, version=None):
+    """Reproject, simplify and index the state boundaries once for every view"""
+    state_boundary_gdf = load_shapefile(state_boundary_path, version)
+    if state_boundary_gdf is None:
+        return None
+    return build_boundary_overlay(state_boundary_gdf)
+
+@st.cache_resource(max_entries=LOADER_MAX_ENTRIES)
+def load_spatial_index(file_path, version=None):
+    """STRtree over the districts for coordinate lookups (shared, not copied per session)"""
+    gdf = load_shapefile(file_path, version)
+    if gdf is None:
+        return None
+    return build_spatial_index(gdf)
+
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def load_district_index(file_path, version=None):
+    """Normalized (state, district) name index for O(1) district lookups"""
+    gdf = load_shapefile(file_path, version)
+    if gdf is None:
+        return None
+    return build_district_index(gdf)
+
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def load_selection_index(file_path, version=None):
+    """Row positions of every state and district, for filtered views that don't copy the layer"""
+    gdf = load_shapefile(file_path, version)
+    if gdf is None:
+        return None
+    return build_selection_index(gdf)
+
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def load_filter_metadata(file_path, version=None, centroids_version=None):
+    """Dropdown options and the framing table of every state and district"""
+    gdf = load_shapefile(file_path, version)
+    if gdf is None:
+        return None
+    return build_filter_metadata(gdf, centroids=load_district_centroids(CENTROIDS_PATH))
+
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def load_geometry_pyramid(file_path, version=None):
+    """Per-zoom simplified district geometry (zoom 4 for All States up to 9 for small states), from the unsimplified layer"""
+    gdf = load_shapefile(file_path, version)
+    if gdf is None:
+        return None
+    return {zoom: level.set_axis(gdf.index) for zoom, level in load_layer_pyramid(file_path).items()}
+
+@st.cache_data(max_entries=LOADER_MAX_ENTRIES)
+def load_warm_views(file_path, version=None):
+    """Views pre-rendered by warmup.py for this shapefile, or None if it hasn't been run"""
+    return load_view_store(file_path)
+
+@st.cache_data(max_entries=RESULT_MAX_ENTRIES)
+def get_map_payload(_gdf, row_ids, category, zoom_level, _pyramid=None, version=None):
+    """Cached minimal GeoJSON for a set of rows (keyed by data version, row ids, objective and zoom)"""
+    rows = list(row_ids)
+    geometries = select_level(_pyramid, zoom_level).loc[rows] if _pyramid is not None else None
+    return build_map_payload(_gdf.loc[rows], category, zoom_level, geometries)
+
+@st.cache_data(max_entries=RESULT_MAX_ENTRIES)
+def get_class_codes(_gdf, row_ids, zoom_level=None, _pyramid=None, version=None):
+    """Cached one-byte-per-district classes of every objective, aligned with get_map_payload's features (all rows without a zoom)"""
+    rows = list(row_ids)
+    view_gdf = _gdf.loc[rows]
+    mapped = None
+    if zoom_level is not None:
+        mapped = mapped_rows(select_level(_pyramid, zoom_level).loc[rows] if _pyramid is not None else view_gdf.geometry)
+    return build_class_codes(view_gdf, list(categories.keys()), mapped)
+
+def select_objective():
+    """Objective selectbox callback"""
+    st.session_state['objective'] = st.session_state['objective_select']
+
+def resolve_objective(default_objective):
+    """The session's objective, switched to the last objective picked on the map if there is a new pick"""
+    picked = st.session_state.get('suitability_map')
+    if picked is not None and picked != st.session_state.get('map_pick'):
+        st.session_state['map_pick'] = picked
+        st.session_state['objective'] = picked['objective']
+    return st.session_state.setdefault('objective', default_objective)
+
+def render_clicked_district(spatial_index, payload_key):
+    """Name and rankings of the district at the last point clicked on the map, if it was clicked in this view"""
+    picked = st.session_state.get('suitability_map')
+    if spatial_index is None or not picked or not picked.get('clicked'):
+        return
+    if picked.get('payload_key') != str(payload_key):
+        # Clicked before the districts shown changed (another state or data version)
+        return
+    latitude, longitude = picked['clicked']
+    site = lookup_points(spatial_index, [longitude], [latitude]).iloc[0]
+    if not is_valid_value(site.get('NAME_2')):
+        st.caption(f"📍 {latitude:.4f}, {longitude:.4f} is outside the districts")
+        return
+    rankings = " · ".join(f"{label}: {site[name]}" for name, label in categories.items()
+                          if name in site.index and is_valid_value(site[name]))
+    st.markdown(f"""
+    <div class="text-box">
+        <div style="font-size: 0.8rem;">📍 <b>{site['NAME_2']}, {site['NAME_1']}</b> ({latitude:.4f}, {longitude:.4f})<br>{rankings}</div>
+    </div>
+    """, unsafe_allow_html=True)
+
 def get_status_class(status):
     """Get CSS class for status based on ranking"""
     if status in ['Very High']:
@@ -293,64 +437,32 @@ def calculate_statistics(gdf, category):
     if category not in gdf.columns:
         return None
     
-    stats = {}
-    # Filter out invalid values before calculating statistics
-    valid_data = gdf[gdf[category].apply(is_valid_value)]
-    
-    if len(valid_data) == 0:
-        return None
-    
-    if valid_data[category].dtype == 'object':
-        value_counts = valid_data[category].value_counts()
-        total = len(valid_data)  # Use valid data count, not all data
-        
-        stats['counts'] = {}
-        for value, count in value_counts.items():
-            if is_valid_value(value):
-                percentage = (count / total) * 100
-                stats['counts'][value] = {
-                    'count': int(count),
-                    'percentage': round(percentage, 2)
-                }
-    return stats
-
-def get_district_details(gdf, state_name, district_name):
-    """Get detailed information for a specific district with better matching"""
+    return summarize_category(gdf[category])
+
+def get_district_details(gdf, state_name, district_name, district_index):
+    """Get detailed information for a specific district from the prebuilt name index"""
     if state_name == "All States" or district_name == "All Districts":
         return None
     
-    # Try exact match first
-    district_data = gdf[
-        (gdf["NAME_1"] == state_name) & 
-        (gdf["NAME_2"] == district_name)
-    ]
-    
-    # If no exact match, try case-insensitive match
-    if len(district_data) == 0:
-        district_data = gdf[
-            (gdf["NAME_1"].str.lower() == state_name.lower()) & 
-            (gdf["NAME_2"].str.lower() == district_name.lower())
-        ]
+    row_label, candidates = lookup_district(district_index, state_name, district_name)
     
-    # If still no match, try partial match
-    if len(district_data) == 0:
-        district_data = gdf[
-            (gdf["NAME_1"].str.contains(state_name, case=False, na=False)) & 
-            (gdf["NAME_2"].str.contains(district_name, case=False, na=False))
-        ]
-    
-    if len(district_data) == 0:
-        st.warning(f"No data found for {district_name}, {state_name}")
+    if row_label is None:
+        if candidates:
+            # Several partial matches - list them (best first) instead of guessing
+            matches = "; ".join(f"{district}, {state}" for _, state, district, _ in candidates)
+            st.warning(f"Several districts match {district_name}, {state_name}: {matches}")
+        else:
+            st.warning(f"No data found for {district_name}, {state_name}")
         return None
     
-    return district_data.iloc[0]
+    return gdf.loc[row_label]
 
 def render_district_dashboard(district_data, selected_category, text_data):
     """Render detailed district-level dashboard with all categories side by side"""
     
     # Get text data for this district
     district_name = district_data.get('NAME_2', 'Unknown District')
-    district_text = text_data[text_data['District'] == district_name].iloc[0] if len(text_data[text_data['District'] == district_name]) > 0 else {}
+    district_text = get_district_text(text_data, district_data.get('NAME_1', ''), district_name)
     
     # Create layout with all sections side by side
     col1, col2, col3, col4, col5, col6 = st.columns(6)
@@ -361,32 +473,29 @@ def render_district_dashboard(district_data, selected_category, text_data):
         
         # Map first - Show district boundary with state boundary overlay
         gdf = st.session_state.get('gdf', None)
-        state_boundary_gdf = st.session_state.get('state_boundary_gdf', None)
+        selection_index = st.session_state.get('selection_index', None)
+        filter_metadata = st.session_state.get('filter_metadata', None)
+        state_boundary_overlay = st.session_state.get('state_boundary_overlay', None)
         
         if gdf is not None:
             state_name = district_data.get('NAME_1', 'Unknown State')
-            district_gdf = gdf[(gdf['NAME_1'] == state_name) & (gdf['NAME_2'] == district_name)]
+            district_gdf = select_view(gdf, selection_index, state_name, district_name)
+            # Center and extent from the framing table, so nothing is reprojected here
+            frame = district_frame(filter_metadata, state_name, district_name)
             
-            if not district_gdf.empty:
-                # Convert to projected CRS for accurate centroid calculation
-                district_gdf_projected = district_gdf.to_crs(epsg=3857)  # Web Mercator
-                centroid_projected = district_gdf_projected.geometry.centroid.iloc[0]
-                # Convert centroid back to WGS84 for folium
-                centroid_wgs = gpd.GeoSeries([centroid_projected], crs='EPSG:3857').to_crs('EPSG:4326').iloc[0]
-                
-                district_gdf_wgs = district_gdf.to_crs(epsg=4326)
-                
+            if not district_gdf.empty and frame is not None:
                 m = folium.Map(
-                    location=[centroid_wgs.y, centroid_wgs.x],
+                    location=frame['center'],
                     zoom_start=8,
                     tiles="CartoDB dark_matter",
                     width='100%',
                     height='250px'
                 )
                 
-                # Add district boundary
+                # Add district boundary (geometry only, no attribute columns)
                 folium.GeoJson(
-                    district_gdf_wgs,
+                    get_map_payload(district_gdf, tuple(district_gdf.index), None, 8, st.session_state.get('geometry_pyramid'),
+                                    st.session_state['data_versions']['districts']),
                     style_function=lambda x: {
                         'fillColor': '#00ADB5',
                         'color': '#00ADB5',
@@ -396,23 +505,12 @@ def render_district_dashboard(district_data, selected_category, text_data):
                 ).add_to(m)
                 
                 # Add state boundary overlay if available
-                if state_boundary_gdf is not None:
-                    # Check what columns the state boundary has
-                    state_cols = state_boundary_gdf.columns.tolist()
-                    state_name_col = None
-                    
-                    # Try to find the state name column
-                    for col in ['NAME_1', 'State', 'STATE', 'state', 'name', 'NAME']:
-                        if col in state_cols:
-                            state_name_col = col
-                            break
-                    
-                    if state_name_col:
-                        state_gdf = state_boundary_gdf[state_boundary_gdf[state_name_col] == state_name]
-                        if not state_gdf.empty:
-                            state_gdf_wgs = state_gdf.to_crs(epsg=4326)
+                if state_boundary_overlay is not None:
+                    if state_boundary_overlay['name_column']:
+                        state_overlay = get_state_overlay(state_boundary_overlay, state_name)
+                        if state_overlay is not None:
                             folium.GeoJson(
-                                state_gdf_wgs,
+                                state_overlay,
                                 style_function=lambda x: {
                                     'fillColor': 'transparent',
                                     'color': 'white',
@@ -421,10 +519,9 @@ def render_district_dashboard(district_data, selected_category, text_data):
                                 }
                             ).add_to(m)
                     else:
-                        # If no matching column found, add all state boundaries
-                        state_gdf_wgs = state_boundary_gdf.to_crs(epsg=4326)
+                        # If no state name column found, add all state boundaries
                         folium.GeoJson(
-                            state_gdf_wgs,
+                            state_boundary_overlay['country'],
                             style_function=lambda x: {
                                 'fillColor': 'transparent',
                                 'color': 'white',
@@ -433,10 +530,8 @@ def render_district_dashboard(district_data, selected_category, text_data):
                             }
                         ).add_to(m)
                 
-                m.fit_bounds([[district_gdf_wgs.geometry.bounds.miny.iloc[0], 
-                             district_gdf_wgs.geometry.bounds.minx.iloc[0]],
-                            [district_gdf_wgs.geometry.bounds.maxy.iloc[0], 
-                             district_gdf_wgs.geometry.bounds.maxx.iloc[0]]])
+                min_x, min_y, max_x, max_y = frame['fit_bounds']
+                m.fit_bounds([[min_y, min_x], [max_y, max_x]])
                 
                 # Use st_folium instead of folium_static
                 st_folium(m, height=250, width=None, returned_objects=[])
@@ -621,45 +716,48 @@ def render_district_dashboard(district_data, selected_category, text_data):
         </div>
         """, unsafe_allow_html=True)
 
-def get_parameter_values(gdf, selected_state, selected_district, param_mapping):
-    filtered_data = gdf.copy()
-    
-    if selected_state != "All States":
-        filtered_data = filtered_data[filtered_data["NAME_1"] == selected_state]
-    
-    if selected_district != "All Districts":
-        filtered_data = filtered_data[filtered_data["NAME_2"] == selected_district]
-    
-    parameter_values = {}
-    for param_name, column_name in param_mapping.items():
-        if column_name in filtered_data.columns:
-            # Filter out invalid values before calculation
-            valid_values = filtered_data[column_name][filtered_data[column_name].apply(is_valid_value)]
-            
-            if len(valid_values) > 0:
-                if valid_values.dtype in ['float64', 'int64']:
-                    # Calculate mean only from valid numeric values
-                    mean_val = valid_values.mean()
-                    if pd.notna(mean_val):
-                        parameter_values[param_name] = f"{mean_val:.2f}"
-                    else:
-                        parameter_values[param_name] = "N/A"
-                else:
-                    # For categorical data, get the most common valid value
-                    mode_values = valid_values.mode()
-                    if len(mode_values) > 0 and is_valid_value(mode_values.iloc[0]):
-                        parameter_values[param_name] = str(mode_values.iloc[0])
-                    else:
-                        parameter_values[param_name] = "N/A"
-            else:
-                parameter_values[param_name] = "N/A"
-        else:
-            parameter_values[param_name] = "N/A"
+def get_parameter_values(filtered_gdf, param_mapping):
+    """Parameter summary of an already filtered view"""
+    return summarize_parameters(filtered_gdf, param_mapping)
+
+def build_map_source(payload_key, boundary_key, selected_state, tile_base_url=None):
+    """Keys and vector tile URLs of a map view's districts and boundary (the tile URLs only with the tile server)"""
+    map_source = {'payload_key': payload_key, 'boundary_key': boundary_key}
+    if tile_base_url is not None:
+        versions = st.session_state['data_versions']
+        state_filter = None if selected_state == "All States" else selected_state
+        map_source['tile_url'] = vector_tiles.get_tile_url(tile_base_url, 'districts', versions['districts'], state_filter)
+        map_source['tile_layer'] = 'districts'
+        if st.session_state.get('state_boundary_overlay', None) is not None:
+            map_source['boundary_tile_url'] = vector_tiles.get_tile_url(tile_base_url, 'states', versions['states'])
+            map_source['boundary_tile_layer'] = 'states'
+    return map_source
+
+def build_map_view_data(filtered_gdf, selected_state, selected_category, zoom_level, aggregates=None, tile_base_url=None):
+    """Every objective's classes of a map view's districts (and their GeoJSON without the tile server), from the cached loaders"""
+    versions = st.session_state['data_versions']
+    if tile_base_url is not None:
+        gdf = st.session_state['gdf']
+        return {'class_codes': get_class_codes(gdf, tuple(gdf.index), version=versions['districts'])}
     
-    return parameter_values
+    row_ids = tuple(filtered_gdf.index)
+    pyramid = st.session_state.get('geometry_pyramid')
+    # Whole-state views come pre-rendered from warmup.py when it has been run
+    warm_view = aggregates['views'].get((selected_state, selected_category)) if aggregates is not None else None
+    if warm_view is not None and warm_view['zoom'] == zoom_level:
+        return {'payload': warm_view['payload'], 'class_codes': warm_view['class_codes']}
+    return {
+        'payload': get_map_payload(filtered_gdf, row_ids, None, zoom_level, pyramid, versions['districts']),
+        'class_codes': get_class_codes(filtered_gdf, row_ids, zoom_level, pyramid, versions['districts'])
+    }
 
-def render_national_state_dashboard(filtered_gdf, selected_category, selected_state):
-    """Render the national/state level dashboard"""
+@st.fragment
+def render_national_state_dashboard(filtered_gdf, selected_category, selected_state, aggregates=None, tile_base_url=None,
+                                    selected_district="All Districts"):
+    """Render the national/state level dashboard (aggregates and vector tiles are for whole-state views)"""
+    # A fragment: picking an objective on the map reruns only this, with statistics from the aggregates
+    previous_pick = st.session_state.get('map_pick')
+    selected_category = resolve_objective(selected_category)
     
     # Main content - 3 columns layout
     map_col, stats_col, params_col = st.columns([2, 1, 1])
@@ -669,98 +767,76 @@ def render_national_state_dashboard(filtered_gdf, selected_category, selected_st
         st.markdown('<div class="section-header">🗺️ Solar Suitability Map</div>', unsafe_allow_html=True)
         
         if not filtered_gdf.empty:
-            # Map bounds calculation
-            if selected_state == "All States":
-                try:
-                    full_bounds = filtered_gdf.geometry.total_bounds
-                    center_lat = (full_bounds[1] + full_bounds[3]) / 2
-                    center_lon = (full_bounds[0] + full_bounds[2]) / 2
-                    center = [center_lat, center_lon]
-                    zoom_level = 4
-                except:
-                    center = [20.5937, 78.9629]
-                    zoom_level = 4
+            # Whole-state views are framed from the filter metadata; other views from their extent
+            frame = view_frame(st.session_state['filter_metadata'], selected_state) if selected_district == "All Districts" else None
+            if frame is not None:
+                center = frame['center']
+                zoom_level = frame['zoom']
+                fit_bounds = frame['fit_bounds']
             else:
                 try:
                     bounds = filtered_gdf.geometry.total_bounds
                     center_lat = (bounds[1] + bounds[3]) / 2
                     center_lon = (bounds[0] + bounds[2]) / 2
                     center = [center_lat, center_lon]
-                    
-                    lat_diff = bounds[3] - bounds[1]
-                    lon_diff = bounds[2] - bounds[0]
-                    
-                    if lat_diff > 8 or lon_diff > 8:
-                        zoom_level = 6
-                    elif lat_diff > 3 or lon_diff > 3:
-                        zoom_level = 7
-                    elif lat_diff > 1 or lon_diff > 1:
-                        zoom_level = 8
-                    else:
-                        zoom_level = 9
+                    zoom_level = view_zoom_level(bounds)
                 except:
                     center = [20.5937, 78.9629]
                     zoom_level = 5
+                fit_bounds = None
             
-            # Create map
-            m = folium.Map(location=center, zoom_start=zoom_level, tiles="CartoDB dark_matter")
-            
-            # Add state boundary overlay if available
-            state_boundary_gdf = st.session_state.get('state_boundary_gdf', None)
-            if state_boundary_gdf is not None:
-                try:
-                    state_boundary_wgs = state_boundary_gdf.to_crs(epsg=4326)
-                    folium.GeoJson(
-                        state_boundary_wgs,
-                        style_function=lambda x: {
-                            'fillColor': 'transparent',
-                            'color': 'white',
-                            'weight': 1,
-                            'fillOpacity': 0
-                        }
-                    ).add_to(m)
-                except Exception as e:
-                    # If there's any issue with state boundary, just skip it
-                    pass
-            
-            # Fit bounds for full view
-            if selected_state == "All States":
-                try:
-                    full_bounds = filtered_gdf.geometry.total_bounds
-                    lat_padding = (full_bounds[3] - full_bounds[1]) * 0.05
-                    lon_padding = (full_bounds[2] - full_bounds[0]) * 0.05
-                    
-                    southwest = [full_bounds[1] - lat_padding, full_bounds[0] - lon_padding]
-                    northeast = [full_bounds[3] + lat_padding, full_bounds[2] + lon_padding]
-                    
-                    m.fit_bounds([southwest, northeast])
-                except:
-                    pass
-            
-            # Style function with updated colors
-            category_colors = get_category_colors(selected_category)
-            ranking_colors = get_ranking_color_gradient()
+            versions = st.session_state['data_versions']
+            if tile_base_url is not None:
+                payload_key = f"{versions['districts']}:tiles:{selected_state}"
+            else:
+                payload_key = f"{versions['districts']}:{zoom_level}:{hash(tuple(filtered_gdf.index))}"
+            boundary_key = f"{versions['states']}:{tile_base_url is not None}"
             
-            def style_function(feature):
-                if selected_category in feature['properties'] and feature['properties'][selected_category] is not None:
-                    category_value = str(feature['properties'][selected_category])
-                    
-                    if category_value in category_colors:
-                        color = category_colors[category_value]
-                    elif category_value in ranking_colors:
-                        color = ranking_colors[category_value]
-                    else:
-                        color = '#757575'  # Grey for unknown values
-                    
-                    return {'fillColor': color, 'color': 'black', 'weight': 1, 'fillOpacity': 0.7}
-                else:
-                    return {'fillColor': '#757575', 'color': 'black', 'weight': 1, 'fillOpacity': 0.7}
+            map_source = build_map_source(payload_key, boundary_key, selected_state, tile_base_url)
+            pick = st.session_state.get('map_pick')
+            if pick is not None and pick.get('inline_data'):
+                # The page couldn't fetch a data file: send this session's map data inline from now on
+                st.session_state['map_inline'] = True
+            inline = st.session_state.get('map_inline', False)
             
-            # Add data to map
-            folium.GeoJson(filtered_gdf, style_function=style_function).add_to(m)
+            # The session keeps only its view's data URLs; the data itself is rebuilt from the cached loaders
+            # when a URL is missing. On the rerun a pick started, the map already shows the view it was
+            # picked on: send only the keys
+            urls_key, urls = st.session_state.get('map_urls', (None, {}))
+            urls = dict(urls) if urls_key == (payload_key, boundary_key) else {}
+            fresh_pick = pick is not None and pick is not previous_pick
+            if not (fresh_pick and pick.get('payload_key') == payload_key):
+                urls['view'] = None if inline else published_url(urls.get('view'))
+                if urls['view'] is None:
+                    view_data = build_map_view_data(filtered_gdf, selected_state, selected_category, zoom_level,
+                                                    aggregates, tile_base_url)
+                    urls['view'] = None if inline else publish_view_data(payload_key, **view_data)
+                    if urls['view'] is None:
+                        map_source.update(view_data)
+                map_source['view_url'] = urls['view']
+            state_boundary_overlay = st.session_state.get('state_boundary_overlay', None)
+            if tile_base_url is None and state_boundary_overlay is not None and not (
+                    fresh_pick and pick.get('boundary_key') == boundary_key):
+                urls['boundary'] = None if inline else published_url(urls.get('boundary'))
+                if urls['boundary'] is None:
+                    urls['boundary'] = None if inline else publish_boundary_data(boundary_key, state_boundary_overlay['country'])
+                    if urls['boundary'] is None:
+                        map_source['boundary'] = state_boundary_overlay['country']
+                map_source['boundary_url'] = urls['boundary']
+            st.session_state['map_urls'] = ((payload_key, boundary_key), urls)
             
-            # Display map
-            st_folium(m, height=400, width=None, returned_objects=[])
+            render_leaflet_map(
+                objective=selected_category,
+                objectives=categories,
+                colors=build_color_tables(categories.keys(), get_category_colors, get_ranking_color_gradient),
+                center=center,
+                zoom=zoom_level,
+                bounds=fit_bounds,
+                max_native_zoom=vector_tiles.MAX_ZOOM,
+                key='suitability_map',
+                **map_source
+            )
+            render_clicked_district(st.session_state.get('spatial_index'), payload_key)
         else:
             st.warning("No data available for selected filters.")
     
@@ -768,7 +844,10 @@ def render_national_state_dashboard(filtered_gdf, selected_category, selected_st
     with stats_col:
         st.markdown('<div class="section-header">📊 Summary Statistics</div>', unsafe_allow_html=True)
         
-        stats = calculate_statistics(filtered_gdf, selected_category)
+        if aggregates is not None:
+            stats = aggregates['statistics'].get((selected_state, selected_category))
+        else:
+            stats = calculate_statistics(filtered_gdf, selected_category)
         
         if stats and 'counts' in stats:
             levels = list(stats['counts'].keys())
@@ -802,44 +881,27 @@ def render_national_state_dashboard(filtered_gdf, selected_category, selected_st
             
             # Compact pie chart
             if len(levels) <= 6:
-                try:
-                    fig, ax = plt.subplots(figsize=(3.5, 3.5))
-                    pie_colors = []
-                    for level in levels:
-                        if level in category_colors:
-                            pie_colors.append(category_colors[level])
-                        elif level in ranking_colors:
-                            pie_colors.append(ranking_colors[level])
-                        else:
-                            pie_colors.append('#757575')
-                    
-                    wedges, texts, autotexts = ax.pie(
-                        percentages, 
-                        colors=pie_colors,
-                        autopct='%1.1f%%',
-                        startangle=90,
-                        textprops={'fontsize': 8}
-                    )
-                    fig.patch.set_facecolor('#2C3E50')
-                    ax.set_facecolor('#2C3E50')
-                    for autotext in autotexts:
-                        autotext.set_color('white')
-                        autotext.set_fontweight('bold')
-                        autotext.set_fontsize(8)
-                    for text in texts:
-                        text.set_fontsize(0)  # Hide labels to save space
-                    plt.tight_layout()
-                    st.pyplot(fig)
-                    plt.close()
-                except Exception as chart_error:
-                    st.write("Chart could not be rendered")
+                pie_colors = []
+                for level in levels:
+                    if level in category_colors:
+                        pie_colors.append(category_colors[level])
+                    elif level in ranking_colors:
+                        pie_colors.append(ranking_colors[level])
+                    else:
+                        pie_colors.append('#757575')
+                
+                # Inline SVG, memoized on the view's percentages and colors
+                st.markdown(build_pie_svg(tuple(percentages), tuple(pie_colors)), unsafe_allow_html=True)
         else:
             st.markdown('<div class="metric-container"><span class="metric-name">No statistics available</span></div>', unsafe_allow_html=True)
     
     # PARAMETERS COLUMN  
     with params_col:
         st.markdown('<div class="section-header">📋 Key Parameters</div>', unsafe_allow_html=True)
-        parameter_values = get_parameter_values(filtered_gdf, selected_state, "All Districts", NATIONAL_PARAMETER_MAPPING)
+        if aggregates is not None and selected_state in aggregates['parameters']:
+            parameter_values = aggregates['parameters'][selected_state]
+        else:
+            parameter_values = get_parameter_values(filtered_gdf, NATIONAL_PARAMETER_MAPPING)
         for param_name, value in parameter_values.items():
             # Get icon
             if "Solar" in param_name:
@@ -863,6 +925,51 @@ def render_national_state_dashboard(filtered_gdf, selected_category, selected_st
             </div>
             """, unsafe_allow_html=True)
 
+def watched_files(shapefile_path):
+    """Files a shapefile's cached layers are built from (its components and warm-up views)"""
+    if shapefile_path is None:
+        return []
+    base_path = os.path.splitext(shapefile_path)[0]
+    return [base_path + ext for ext in SOURCE_COMPONENTS] + [get_view_store_path(shapefile_path)]
+
+def warm_caches(shapefile_path, state_boundary_path, versions, changed):
+    """Build every cache that depends on a changed source, before its new version is published"""
+    if 'states' in changed and state_boundary_path:
+        load_shapefile(state_boundary_path, versions['states'])
+        load_boundary_overlay(state_boundary_path, versions['states'])
+    if 'districts' in changed and shapefile_path:
+        load_shapefile(shapefile_path, versions['districts'])
+        load_geometry_pyramid(shapefile_path, versions['districts'])
+        load_district_index(shapefile_path, versions['districts'])
+        load_selection_index(shapefile_path, versions['districts'])
+        load_spatial_index(shapefile_path, versions['districts'])
+        load_aggregate_cube(shapefile_path, versions['districts'])
+    if changed & {'districts', 'centroids'} and shapefile_path:
+        load_filter_metadata(shapefile_path, versions['districts'], versions['centroids'])
+    if changed & {'districts', 'states'} and shapefile_path:
+        start_vector_tiles(shapefile_path, state_boundary_path, versions['districts'], versions['states'])
+    if 'text' in changed:
+        load_text_data(versions['text'])
+
+@st.cache_resource
+def start_data_watcher(shapefile_path, state_boundary_path):
+    """Watch the data files on a background thread (once per process)"""
+    sources = {
+        'districts': watched_files(shapefile_path),
+        'centroids': [CENTROIDS_PATH],
+        'states': watched_files(state_boundary_path),
+        'text': TEXT_SOURCES
+    }
+    def rebuild(versions, changed):
+        warm_caches(shapefile_path, state_boundary_path, versions, changed)
+    return data_watcher.start_watcher(sources, rebuild)
+
+@st.fragment(run_every=data_watcher.POLL_INTERVAL)
+def reload_on_new_data():
+    """Rerun the page once the watcher has swapped in new data"""
+    if data_watcher.current_versions() != st.session_state.get('data_versions'):
+        st.rerun()
+
 # Main app logic
 def main():
     # Function to find shapefiles in current directory and subdirectories
@@ -916,22 +1023,32 @@ def main():
         "India_State_Boundary.shp"
     ]
     
-    state_boundary_gdf = None
+    state_boundary_path = next((path for path in state_boundary_paths if os.path.exists(path)), None)
     
-    for path in state_boundary_paths:
-        if os.path.exists(path):
-            state_boundary_gdf = load_shapefile(path)
-            if state_boundary_gdf is not None:
-                break
+    # One consistent snapshot of data versions for this run; the watcher swaps in new ones
+    start_data_watcher(shapefile_path, state_boundary_path)
+    versions = data_watcher.current_versions()
+    st.session_state['data_versions'] = versions
+    
+    state_boundary_gdf = load_shapefile(state_boundary_path, versions['states']) if state_boundary_path else None
+    if state_boundary_gdf is None:
+        state_boundary_path = None
     
     # Load main shapefile
-    gdf = load_shapefile(shapefile_path) if shapefile_path else None
-    text_data = load_text_data()
+    gdf = load_shapefile(shapefile_path, versions['districts']) if shapefile_path else None
+    text_data = load_text_data(versions['text'])
+    reload_on_new_data()
 
     if gdf is not None:
         # Store GeoDataFrame in session state for use in district view
         st.session_state['gdf'] = gdf
+        st.session_state['selection_index'] = load_selection_index(shapefile_path, versions['districts'])
+        filter_metadata = load_filter_metadata(shapefile_path, versions['districts'], versions['centroids'])
+        st.session_state['filter_metadata'] = filter_metadata
+        st.session_state['spatial_index'] = load_spatial_index(shapefile_path, versions['districts'])
         st.session_state['state_boundary_gdf'] = state_boundary_gdf
+        st.session_state['geometry_pyramid'] = load_geometry_pyramid(shapefile_path, versions['districts'])
+        st.session_state['state_boundary_overlay'] = load_boundary_overlay(state_boundary_path, versions['states']) if state_boundary_path else None
         
         # Dashboard header
         st.markdown('<h1 class="dashboard-title">🌞 Solar Suitability Dashboard</h1>', unsafe_allow_html=True)
@@ -942,57 +1059,53 @@ def main():
         
         with col1:
             st.markdown("**🌍 State**")
-            states = ["All States"]
-            if "NAME_1" in gdf.columns:
-                valid_states = [str(s) for s in gdf["NAME_1"].unique() if s is not None and str(s) != "nan"]
-                states.extend(sorted(valid_states))
+            states = ["All States"] + filter_metadata['states']
             selected_state = st.selectbox("State", states, label_visibility="collapsed")
         
         with col2:
             st.markdown("**🏘️ District**")
-            if selected_state != "All States":
-                state_filtered = gdf[gdf["NAME_1"] == selected_state]
-            else:
-                state_filtered = gdf
-            
-            districts = ["All Districts"]
-            if "NAME_2" in gdf.columns:
-                valid_districts = [str(d) for d in state_filtered["NAME_2"].unique() if d is not None and str(d) != "nan"]
-                districts.extend(sorted(valid_districts))
+            districts = ["All Districts"] + district_options(filter_metadata, selected_state)
             selected_district = st.selectbox("District", districts, label_visibility="collapsed")
         
         with col3:
             st.markdown("**🎯 Objective**")
             objective_options = list(categories.keys())
+            # Show the session's objective, which objectives picked on the map also set
+            st.session_state['objective_select'] = resolve_objective(objective_options[0])
             selected_category = st.selectbox(
                 "Objective",
                 objective_options,
+                key='objective_select',
+                on_change=select_objective,
                 format_func=lambda x: categories[x],
                 label_visibility="collapsed"
             )
         
         st.markdown('</div>', unsafe_allow_html=True)
         
-        # Apply filters
-        filtered_gdf = gdf.copy()
-        if selected_state != "All States":
-            filtered_gdf = filtered_gdf[filtered_gdf["NAME_1"] == selected_state]
-        if selected_district != "All Districts":
-            filtered_gdf = filtered_gdf[filtered_gdf["NAME_2"] == selected_district]
+        # Apply filters - a positional view of the loaded layer, not a copy
+        filtered_gdf = select_view(gdf, st.session_state['selection_index'], selected_state, selected_district)
         
         # Check if showing district-level detail
         show_district_dashboard = (selected_state != "All States" and selected_district != "All Districts")
         
         if show_district_dashboard:
             # Show detailed district dashboard
-            district_data = get_district_details(gdf, selected_state, selected_district)
+            district_data = get_district_details(gdf, selected_state, selected_district, load_district_index(shapefile_path, versions['districts']))
             if district_data is not None:
                 render_district_dashboard(district_data, selected_category, text_data)
             else:
                 st.error("District data not found")
         else:
-            # Show original national/state level dashboard
-            render_national_state_dashboard(filtered_gdf, selected_category, selected_state)
+            # Show original national/state level dashboard, using the precomputed
+            # aggregates whenever the view is a whole state (or the whole country)
+            if selected_district == "All Districts":
+                aggregates = load_aggregate_cube(shapefile_path, versions['districts'])
+                tile_base_url = start_vector_tiles(shapefile_path, state_boundary_path, versions['districts'], versions['states'])
+            else:
+                aggregates = None
+                tile_base_url = None
+            render_national_state_dashboard(filtered_gdf, selected_category, selected_state, aggregates, tile_base_url, selected_district)
     else:
         st.error("Could not load main shapefile. Please check file availability.")
         
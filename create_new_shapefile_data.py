@@ -1,35 +1,55 @@
+import sys
+
 import pandas as pd
-import numpy as np
 
-def clean_data_value(value):
-    """Clean and standardize data values, converting various forms of missing data to NaN"""
-    if pd.isna(value):
-        return np.nan
-    
-    # Convert to string for checking
-    str_val = str(value).strip()
-    
-    # List of values to treat as missing/invalid
-    invalid_values = ['', 'XX', 'N/A', 'n/a', 'nan', 'NaN', 'null', 'NULL', '#N/A', '-', 'None', 'none']
-    
-    if str_val.lower() in [v.lower() for v in invalid_values]:
-        return np.nan
-    
-    # Try to convert to numeric if possible
-    try:
-        numeric_val = pd.to_numeric(str_val)
-        # Check for unrealistic values that might be data errors
-        if numeric_val == 0 and str_val != '0':  # Zero that wasn't originally zero
-            return np.nan
-        return numeric_val
-    except (ValueError, TypeError):
-        # Return as string if not numeric
-        return str_val if str_val else np.nan
+from data_cleaning import clean_columns
+from incremental_build import (
+    describe_inputs, is_incremental, is_up_to_date, load_manifest, manifest_key, record_output, save_manifest
+)
+from workbook_ingest import load_source, load_source_tables, source_files, use_workbook
+
+national_output_path = 'national_state_shapefile_data.csv'
+district_output_path = 'district_shapefile_data.csv'
+text_output_path = 'district_text_data.csv'
+
+# Source tables are streamed from the workbook when it is available (--csv uses the CSV exports)
+from_workbook = use_workbook()
+
+# With --incremental, outputs whose inputs (and cleaning code) are unchanged are skipped
+incremental = is_incremental()
+manifest = load_manifest()
+code_inputs = ['create_new_shapefile_data.py', 'data_cleaning.py', 'workbook_ingest.py']
+output_entries = {
+    national_output_path: describe_inputs(
+        source_files(['Country_State_Param_Values.csv', 'Solar_new_ranking.csv'], from_workbook)
+        + ['Country_State_ColNames.csv'] + code_inputs
+    ),
+    district_output_path: describe_inputs(
+        source_files(['District_Param_Values.csv', 'Solar_new_ranking.csv'], from_workbook)
+        + ['District_ColNames.csv'] + code_inputs
+    ),
+    text_output_path: describe_inputs(
+        source_files(['District_Param_Values.csv', 'Solar_new_ranking.csv'], from_workbook)
+        + ['District_ColNames.csv'] + code_inputs
+    )
+}
+manifest_keys = {path: manifest_key('create_new_shapefile_data.py', path) for path in output_entries}
+up_to_date = {
+    path: incremental and is_up_to_date(manifest, manifest_keys[path], path, entry)
+    for path, entry in output_entries.items()
+}
+if all(up_to_date.values()):
+    print("✅ All outputs are up to date, nothing to rebuild")
+    sys.exit(0)
 
 # Load the data files
-country_state_params = pd.read_csv('Country_State_Param_Values.csv')
-district_params = pd.read_csv('District_Param_Values.csv')
-solar_ranking = pd.read_csv('Solar_new_ranking.csv')
+source_tables = None
+if from_workbook:
+    print("Reading source sheets from the workbook...")
+    source_tables = load_source_tables()
+country_state_params = load_source('Country_State_Param_Values.csv', source_tables)
+district_params = load_source('District_Param_Values.csv', source_tables)
+solar_ranking = load_source('Solar_new_ranking.csv', source_tables)
 country_state_colnames = pd.read_csv('Country_State_ColNames.csv')
 district_colnames = pd.read_csv('District_ColNames.csv')
 
@@ -40,20 +60,20 @@ print(f"Solar ranking: {len(solar_ranking)} rows")
 # Clean the data
 print("\n=== Cleaning Data ===")
 
-# Clean country/state params
-for col in country_state_params.columns:
-    if col != 'District':
-        country_state_params[col] = country_state_params[col].apply(clean_data_value)
+# Clean country/state params (column-wise, typed output)
+country_state_params = clean_columns(country_state_params, skip_columns=['District'])
 
 # Clean district params
-for col in district_params.columns:
-    if col != 'District' and not col.startswith('Text-'):
-        district_params[col] = district_params[col].apply(clean_data_value)
+district_params = clean_columns(
+    district_params,
+    skip_columns=['District'] + [col for col in district_params.columns if col.startswith('Text-')]
+)
 
 # Clean solar ranking
 for col in solar_ranking.columns:
     if col != 'District':
-        solar_ranking[col] = solar_ranking[col].apply(lambda x: x if pd.notna(x) and str(x).strip() else 'No Data')
+        values = solar_ranking[col]
+        solar_ranking[col] = values.where(values.notna() & (values.astype(str).str.strip() != ''), 'No Data')
 
 print("Data cleaning completed.")
 
@@ -92,7 +112,11 @@ for col in shapefile_data_national.columns:
         print(f"  {col}: {missing_count} missing values ({missing_count/len(shapefile_data_national)*100:.1f}%)")
 
 # Save national/state data
-shapefile_data_national.to_csv('national_state_shapefile_data.csv', index=False)
+if up_to_date[national_output_path]:
+    print(f"⏭️  {national_output_path} is up to date, skipped")
+else:
+    shapefile_data_national.to_csv(national_output_path, index=False)
+    record_output(manifest, manifest_keys[national_output_path], national_output_path, output_entries[national_output_path])
 
 # Create the district level shapefile data
 print("\n=== Creating District Level Data ===")
@@ -129,7 +153,11 @@ for col in shapefile_data_district.columns:
         print(f"  {col}: {missing_count} missing values ({missing_count/len(shapefile_data_district)*100:.1f}%)")
 
 # Save district data
-shapefile_data_district.to_csv('district_shapefile_data.csv', index=False)
+if up_to_date[district_output_path]:
+    print(f"⏭️  {district_output_path} is up to date, skipped")
+else:
+    shapefile_data_district.to_csv(district_output_path, index=False)
+    record_output(manifest, manifest_keys[district_output_path], district_output_path, output_entries[district_output_path])
 
 # Create text data CSV (separate from shapefile)
 print("\n=== Creating Text Data CSV ===")
@@ -142,9 +170,14 @@ text_columns = ['Text-Crop', 'Text-Water', 'Text-Energy', 'Text-Farmer', 'Text-U
 for col in text_columns:
     if col in district_data.columns:
         # Clean text data - replace various forms of missing data with empty string
-        text_data[col] = district_data[col].apply(lambda x: str(x).strip() if pd.notna(x) and str(x).strip() not in ['N/A', 'nan', 'NaN', 'null', 'NULL'] else '')
+        stripped = district_data[col].astype(str).str.strip()
+        text_data[col] = stripped.where(district_data[col].notna() & ~stripped.isin(['N/A', 'nan', 'NaN', 'null', 'NULL']), '')
 
-text_data.to_csv('district_text_data.csv', index=False)
+if up_to_date[text_output_path]:
+    print(f"⏭️  {text_output_path} is up to date, skipped")
+else:
+    text_data.to_csv(text_output_path, index=False)
+    record_output(manifest, manifest_keys[text_output_path], text_output_path, output_entries[text_output_path])
 
 print(f"Text data shape: {text_data.shape}")
 print(f"Text data columns: {list(text_data.columns)}")
@@ -156,6 +189,8 @@ for col in text_columns:
         non_empty = (text_data[col] != '').sum()
         print(f"  {col}: {non_empty} districts have text ({non_empty/len(text_data)*100:.1f}%)")
 
+save_manifest(manifest)
+
 # Create parameter mapping for the updated app
 print("\n=== Creating Parameter Mappings ===")
 
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import sys
+
+import geopandas as gpd
+import pandas as pd
+import pyarrow as pa
+
+from data_cleaning import IDENTIFIER_COLUMNS, normalize_missing_values
+from geometry_pyramid import build_geometry_pyramid, simplify_coverage
+
+# Precompiled Arrow bundle next to a shapefile (simplified WKB, typed attributes and
+# the geometry pyramid), stamped with the source hash so a stale bundle is never served.
+
+BUNDLE_FORMAT_VERSION = 4
+BUNDLE_EXTENSION = '.arrow'
+BUNDLE_METADATA_KEY = b'solar_bundle'
+SOURCE_COMPONENTS = ['.shp', '.shx', '.dbf', '.prj', '.cpg']
+PYRAMID_COLUMN_PREFIX = '__pyramid_z'
+
+# Only large layers are simplified (topology-preserving, see geometry_pyramid.py)
+SIMPLIFY_MIN_ROWS = 100
+SIMPLIFY_TOLERANCE = 0.001
+
+def get_bundle_path(shapefile_path):
+    """Return the bundle path that belongs to a shapefile"""
+    return os.path.splitext(shapefile_path)[0] + BUNDLE_EXTENSION
+
+def compute_source_hash(shapefile_path):
+    """Hash the bytes of every shapefile component that exists on disk"""
+    base_path = os.path.splitext(shapefile_path)[0]
+    digest = hashlib.sha256()
+    digest.update(str(BUNDLE_FORMAT_VERSION).encode())
+    found = False
+
+    for ext in SOURCE_COMPONENTS:
+        component = base_path + ext
+        if not os.path.exists(component):
+            continue
+        found = True
+        digest.update(ext.encode())
+        with open(component, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+
+    return digest.hexdigest() if found else None
+
+def simplify_layer(gdf):
+    """Apply the load-time simplification rule used by the dashboard"""
+    if len(gdf) > SIMPLIFY_MIN_ROWS:
+        gdf = gdf.copy()
+        gdf.geometry = simplify_coverage(gdf.geometry.to_numpy(), SIMPLIFY_TOLERANCE)
+        return gdf, SIMPLIFY_TOLERANCE
+    return gdf, 0.0
+
+def write_bundle(gdf, bundle_path, source_hash, tolerance=0.0, pyramid=None):
+    """Write a GeoDataFrame (and its geometry pyramid, aligned to its rows) to an Arrow IPC bundle with WKB geometry"""
+    geometry_name = gdf.geometry.name
+    attributes = gdf.drop(columns=[geometry_name])
+    table = pa.Table.from_pandas(attributes, preserve_index=False)
+    table = table.append_column(geometry_name, pa.array(gdf.geometry.to_wkb(), type=pa.binary()))
+    pyramid = pyramid or {}
+    for zoom in sorted(pyramid):
+        table = table.append_column(f"{PYRAMID_COLUMN_PREFIX}{zoom}", pa.array(pyramid[zoom].to_wkb(), type=pa.binary()))
+
+    bundle_info = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'source_hash': source_hash,
+        'geometry_column': geometry_name,
+        'crs': gdf.crs.to_wkt() if gdf.crs is not None else None,
+        'simplify_tolerance': tolerance,
+        'pyramid_zooms': sorted(pyramid),
+        'rows': len(gdf)
+    }
+    metadata = dict(table.schema.metadata or {})
+    metadata[BUNDLE_METADATA_KEY] = json.dumps(bundle_info).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    # Write to a temporary file first so readers never see a half-written bundle
+    tmp_path = bundle_path + '.tmp'
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, bundle_path)
+
+    return bundle_info
+
+def read_bundle_info(bundle_path):
+    """Read only the bundle metadata, without materialising any columns"""
+    if not os.path.exists(bundle_path):
+        return None
+    try:
+        with pa.memory_map(bundle_path, 'r') as source:
+            schema = pa.ipc.open_file(source).schema
+    except (pa.ArrowInvalid, OSError):
+        return None
+    raw_info = (schema.metadata or {}).get(BUNDLE_METADATA_KEY)
+    return json.loads(raw_info) if raw_info else None
+
+def read_bundle(bundle_path, zero_copy=False):
+    """Memory-map an Arrow IPC bundle and rebuild the GeoDataFrame"""
+    with pa.memory_map(bundle_path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+
+    bundle_info = json.loads(table.schema.metadata[BUNDLE_METADATA_KEY])
+    geometry_name = bundle_info['geometry_column']
+    table = table.drop_columns([f"{PYRAMID_COLUMN_PREFIX}{zoom}" for zoom in bundle_info.get('pyramid_zooms', [])])
+
+    geometry = gpd.GeoSeries.from_wkb(
+        table.column(geometry_name).to_numpy(zero_copy_only=False),
+        crs=bundle_info['crs']
+    )
+    if zero_copy:
+        # Arrow-backed columns keep pointing into the mapped file instead of being copied; the
+        # small name columns are converted as in a normal read so missing names stay NaN, not pd.NA
+        attributes = table.drop_columns([geometry_name]).to_pandas(types_mapper=pd.ArrowDtype)
+        for column in IDENTIFIER_COLUMNS:
+            if column in attributes.columns:
+                attributes[column] = table.column(column).to_pandas()
+    else:
+        attributes = table.drop_columns([geometry_name]).to_pandas()
+    attributes[geometry_name] = geometry.values
+    return gpd.GeoDataFrame(attributes, geometry=geometry_name, crs=bundle_info['crs'])
+
+def read_bundle_pyramid(bundle_path):
+    """Read only the geometry pyramid of a bundle: {zoom: GeoSeries in EPSG:4326}, or None if it has none"""
+    with pa.memory_map(bundle_path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+
+    bundle_info = json.loads(table.schema.metadata[BUNDLE_METADATA_KEY])
+    if not bundle_info.get('pyramid_zooms'):
+        return None
+    return {
+        zoom: gpd.GeoSeries.from_wkb(
+            table.column(f"{PYRAMID_COLUMN_PREFIX}{zoom}").to_numpy(zero_copy_only=False), crs='EPSG:4326'
+        )
+        for zoom in bundle_info['pyramid_zooms']
+    }
+
+def get_current_bundle_path(shapefile_path):
+    """The shapefile's bundle path if the bundle is of this format and built from these source files, else None"""
+    bundle_path = get_bundle_path(shapefile_path)
+    bundle_info = read_bundle_info(bundle_path)
+    if bundle_info is None or bundle_info.get('format_version') != BUNDLE_FORMAT_VERSION:
+        return None
+
+    # When the shapefile is deployed alongside the bundle, make sure they agree
+    source_hash = compute_source_hash(shapefile_path)
+    if source_hash is not None and source_hash != bundle_info.get('source_hash'):
+        return None
+
+    return bundle_path
+
+def load_bundle(shapefile_path):
+    """Return the bundled layer for a shapefile, or None if it is missing or stale"""
+    bundle_path = get_current_bundle_path(shapefile_path)
+    return read_bundle(bundle_path) if bundle_path is not None else None
+
+def load_layer_pyramid(shapefile_path):
+    """Geometry pyramid of a layer, built from its unsimplified geometry (read from the bundle when it is current)"""
+    bundle_path = get_current_bundle_path(shapefile_path)
+    pyramid = read_bundle_pyramid(bundle_path) if bundle_path is not None else None
+    if pyramid is None:
+        os.environ['SHAPE_RESTORE_SHX'] = 'YES'
+        pyramid = build_geometry_pyramid(gpd.read_file(shapefile_path, columns=[]))
+    return pyramid
+
+def build_bundle(shapefile_path):
+    """Parse a shapefile once and write its precompiled bundle"""
+    os.environ['SHAPE_RESTORE_SHX'] = 'YES'
+    gdf = normalize_missing_values(gpd.read_file(shapefile_path))
+    # Pyramid levels come from the full-detail geometry, not from the simplified layer
+    pyramid = build_geometry_pyramid(gdf)
+    gdf, tolerance = simplify_layer(gdf)
+    return write_bundle(gdf, get_bundle_path(shapefile_path), compute_source_hash(shapefile_path), tolerance, pyramid)
+
+if __name__ == "__main__":
+    shapefile_paths = sys.argv[1:] or [
+        'Shapefiles/true_solar_suitability_with_data.shp',
+        'Shapefiles/India_State_Boundary.shp'
+    ]
+
+    print("=== Building Data Bundles ===")
+    for path in shapefile_paths:
+        if not os.path.exists(path):
+            print(f"⚠️  {path} not found, skipping")
+            continue
+        info = build_bundle(path)
+        print(f"✅ {get_bundle_path(path)}: {info['rows']} rows, hash {info['source_hash'][:12]}")
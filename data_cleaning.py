@@ -0,0 +1,87 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Vectorized handling of the missing-value sentinels used across the source data
+# ('XX', 'N/A', '-', '#N/A', ...). Layers are normalised once when they are
+# loaded, so the dashboard only ever sees proper NA in typed nullable columns.
+
+# Lower-cased tokens treated as missing; the single definition behind is_valid_value,
+# the layer normalisation and the workbook cleaning in create_new_shapefile_data.py
+MISSING_VALUE_TOKENS = ['', 'xx', 'n/a', 'nan', 'null', '#n/a', '-', 'none', 'na']
+
+# Name columns are identifiers, not parameters, and are left untouched
+IDENTIFIER_COLUMNS = ['NAME_0', 'NAME_1', 'NAME_2']
+
+def missing_value_mask(series):
+    """Vectorized equivalent of `not is_valid_value(value)` for a whole column"""
+    text = series.astype('string').str.strip().str.lower()
+    return series.isna() | text.isin(MISSING_VALUE_TOKENS).fillna(True).astype(bool)
+
+def is_valid_value(value):
+    """Check if a value is valid (not N/A, blank, or other missing indicators)"""
+    if value is None or pd.isna(value):
+        return False
+    return str(value).strip().lower() not in MISSING_VALUE_TOKENS
+
+def clean_column(series):
+    """Column-wise clean_data_value: sentinels and zeros not written as '0' become NA, numbers are typed"""
+    text = series.astype('string').str.strip().mask(missing_value_mask(series))
+    numeric = pd.to_numeric(text, errors='coerce')
+    is_number = numeric.notna().to_numpy()
+    is_text = text.notna().to_numpy() & ~is_number
+
+    # A zero that wasn't originally '0' (e.g. '0.0', '-0') is treated as a data error
+    bad_zero = (numeric == 0).fillna(False).to_numpy(bool) & (text != '0').fillna(False).to_numpy(bool)
+    numbers = is_number & ~bad_zero
+
+    whole = text.str.fullmatch(r'[+-]?\d+').fillna(False).to_numpy(bool)
+    if not is_text.any():
+        integral = whole[numbers].all()
+        return numeric.where(numbers).astype('Int64' if integral else 'Float64')
+    if not numbers.any():
+        return text.where(is_text)
+
+    # Mixed numbers and labels stay an object column, as the per-cell cleaner produced:
+    # whole numbers as ints, other numbers as floats
+    cleaned = pd.Series(np.nan, index=series.index, dtype=object)
+    cleaned[is_text] = text[is_text].astype(object)
+    ints = numbers & whole
+    floats = numbers & ~whole
+    cleaned[ints] = [int(value) for value in text[ints]]
+    cleaned[floats] = numeric[floats].astype(float).astype(object)
+    return cleaned
+
+def clean_columns(df, skip_columns=()):
+    """Return a copy of df with every column not in skip_columns passed through clean_column"""
+    df = df.copy()
+    for column in df.columns:
+        if column not in skip_columns:
+            df[column] = clean_column(df[column])
+    return df
+
+def to_typed_column(series):
+    """Replace missing sentinels with NA and return a nullable numeric or string column"""
+    cleaned = series.mask(missing_value_mask(series))
+    numeric = pd.to_numeric(cleaned, errors='coerce')
+
+    # Only treat the column as numeric if every remaining value converted
+    if numeric.notna().sum() == cleaned.notna().sum():
+        return numeric.astype('Float64')
+    return cleaned.astype('string')
+
+def normalize_missing_values(df, skip_columns=IDENTIFIER_COLUMNS):
+    """Return a copy of df with every attribute column converted by to_typed_column"""
+    df = df.copy()
+    for column in df.columns:
+        if column in skip_columns or df[column].dtype.name == 'geometry':
+            continue
+        df[column] = to_typed_column(df[column])
+    return df
+
+def normalize_name(name):
+    """Lower-case a place name and drop punctuation so 'Andaman & Nicobar' matches 'andaman and nicobar'"""
+    name = str(name).lower().replace('&', ' and ')
+    name = re.sub(r'[^a-z0-9]+', ' ', name)
+    return ' '.join(name.split())
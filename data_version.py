@@ -0,0 +1,55 @@
+import hashlib
+import os
+
+from data_bundle import SOURCE_COMPONENTS
+
+# Content fingerprints of the data files, passed to cached functions so their
+# keys change exactly when the data does.
+
+_content_hashes = {}
+_seen_versions = {}
+
+def file_signature(path):
+    """(size, mtime) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+def file_content_hash(path):
+    """sha256 of a file's bytes, recomputed only when its size or mtime changes"""
+    signature = file_signature(path)
+    if signature is None:
+        return None
+    cached = _content_hashes.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    _content_hashes[path] = (signature, digest.hexdigest())
+    return digest.hexdigest()
+
+def data_version(paths):
+    """Content fingerprint of a set of files (missing files count as absent)"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.encode())
+        digest.update((file_content_hash(path) or 'missing').encode())
+    return digest.hexdigest()[:16]
+
+def shapefile_version(shapefile_path):
+    """Data version of every component of a shapefile"""
+    if shapefile_path is None:
+        return None
+    base_path = os.path.splitext(shapefile_path)[0]
+    return data_version([base_path + ext for ext in SOURCE_COMPONENTS])
+
+def version_changed(name, version):
+    """True once when a named data source's version differs from the one last seen in this process"""
+    previous = _seen_versions.get(name)
+    _seen_versions[name] = version
+    return previous is not None and previous != version
@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+
+from data_version import data_version
+
+# Hot reload: a daemon thread polls the data files and publishes a source's new
+# version only once every cache built from it has been rebuilt.
+
+POLL_INTERVAL = float(os.environ.get('SOLAR_WATCH_INTERVAL', '2'))
+
+_sources = {}
+_versions = {}
+_pending = None
+_failed = None
+_rebuild = None
+_watcher = None
+_watcher_lock = threading.Lock()
+
+def source_versions(sources):
+    """{source name: content version of its files}"""
+    return {name: data_version(paths) for name, paths in sources.items()}
+
+def current_versions():
+    """The published snapshot of source versions (never mutated, only replaced)"""
+    return _versions
+
+def check_for_changes():
+    """Rebuild and publish sources whose files changed; return the names that were swapped in"""
+    global _versions, _pending, _failed
+    latest = source_versions(_sources)
+    if latest == _versions or latest == _failed:
+        _pending = None
+        return set()
+    if latest != _pending:
+        # Wait one more poll for writers to finish
+        _pending = latest
+        return set()
+
+    changed = {name for name, version in latest.items() if _versions.get(name) != version}
+    try:
+        if _rebuild is not None:
+            _rebuild(latest, changed)
+    except Exception as e:
+        # Keep serving the old data; retry once the files change again
+        print(f"⚠️  Reload of {', '.join(sorted(changed))} failed: {e}")
+        _failed = latest
+        return set()
+
+    _versions = latest
+    _pending = None
+    return changed
+
+def _watch(interval):
+    while True:
+        time.sleep(interval)
+        check_for_changes()
+
+def start_watcher(sources, rebuild=None, interval=POLL_INTERVAL):
+    """Start watching {source name: [paths]} (once per process) and return the current versions"""
+    global _sources, _versions, _rebuild, _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _sources = {name: list(paths) for name, paths in sources.items()}
+            _versions = source_versions(_sources)
+            _rebuild = rebuild
+            _watcher = threading.Thread(target=_watch, args=(interval,), daemon=True)
+            _watcher.start()
+    return _versions
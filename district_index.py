@@ -0,0 +1,72 @@
+import difflib
+
+import pandas as pd
+
+from data_cleaning import normalize_name
+
+# Normalized (state, district) name index for district lookups.
+
+FUZZY_CUTOFF = 0.75
+MAX_CANDIDATES = 5
+
+def _compact(name):
+    return name.replace(' ', '')
+
+def build_district_index(gdf, state_column='NAME_1', district_column='NAME_2', aliases=None):
+    """Map normalized (state, district) keys to row labels of gdf"""
+    districts = {}
+    states = {}
+
+    for label, state, district in zip(gdf.index, gdf[state_column], gdf[district_column]):
+        if pd.isna(state) or pd.isna(district):
+            continue
+        state_key = normalize_name(state)
+        district_key = normalize_name(district)
+        entry = (label, str(state), str(district))
+
+        state_districts = states.setdefault(state_key, {})
+        for key in {district_key, _compact(district_key)}:
+            state_districts.setdefault(key, entry)
+            districts.setdefault((state_key, key), entry)
+
+    # Extra spellings, e.g. {('odisha', 'angul'): ('Odisha', 'Anugul')}
+    for (alias_state, alias_district), (state, district) in (aliases or {}).items():
+        target = districts.get((normalize_name(state), normalize_name(district)))
+        if target is not None:
+            districts.setdefault((normalize_name(alias_state), normalize_name(alias_district)), target)
+            states.setdefault(normalize_name(alias_state), {}).setdefault(normalize_name(alias_district), target)
+
+    return {'districts': districts, 'states': states}
+
+def _resolve_state_keys(index, state_key):
+    """State keys to search: the exact state if known, otherwise the closest partial/fuzzy matches"""
+    if state_key in index['states']:
+        return [state_key]
+    partial = [key for key in index['states'] if state_key in key or key in state_key]
+    return partial or difflib.get_close_matches(state_key, index['states'].keys(), n=3, cutoff=FUZZY_CUTOFF)
+
+def lookup_district(index, state_name, district_name):
+    """Return (row_label, candidates): a label on a unique match, else ranked (score, state, district, label) tuples"""
+    state_key = normalize_name(state_name)
+    district_key = normalize_name(district_name)
+
+    # Exact hit on the normalized names (or their space-free form)
+    for key in (district_key, _compact(district_key)):
+        entry = index['districts'].get((state_key, key))
+        if entry is not None:
+            return entry[0], []
+
+    # Fallback: partial and fuzzy matches within the matching state(s), ranked by similarity
+    scored = {}
+    for candidate_state in _resolve_state_keys(index, state_key):
+        for key, entry in index['states'][candidate_state].items():
+            score = difflib.SequenceMatcher(None, district_key, key).ratio()
+            if district_key in key or key in district_key or score >= FUZZY_CUTOFF:
+                label, state, district = entry
+                best_score = max(scored.get(label, (0,))[0], score)
+                scored[label] = (best_score, state, district, label)
+
+    candidates = sorted(scored.values(), key=lambda candidate: candidate[0], reverse=True)[:MAX_CANDIDATES]
+    if len(candidates) == 1:
+        return candidates[0][3], candidates
+    return None, candidates
@@ -0,0 +1,115 @@
+import os
+
+import pandas as pd
+
+from map_payload import view_zoom_level
+
+# Dropdown options and the map framing (bounds, center, zoom) of every state and district.
+
+CENTROIDS_PATH = 'true_solar_suitability.csv'
+FIT_PADDING = 0.05
+
+def _sorted_names(values):
+    """Sorted distinct names as strings, without missing values"""
+    return sorted({str(value) for value in values if not pd.isna(value) and str(value) != "nan"})
+
+def _name_strings(series):
+    """Names as strings, missing names left as NA so groupby skips them"""
+    return series.astype(object).where(series.notna()).map(str, na_action='ignore').to_numpy()
+
+def _frame(bounds, whole_country=False, center=None):
+    """Center, zoom and fit bounds of a view's extent (padded for the whole country)"""
+    min_x, min_y, max_x, max_y = (float(value) for value in bounds)
+    frame = {
+        'bounds': [min_x, min_y, max_x, max_y],
+        'center': list(center) if center is not None else [(min_y + max_y) / 2, (min_x + max_x) / 2],
+        'zoom': view_zoom_level(bounds, whole_country),
+        'fit_bounds': None
+    }
+    if whole_country:
+        lat_padding = (max_y - min_y) * FIT_PADDING
+        lon_padding = (max_x - min_x) * FIT_PADDING
+        frame['fit_bounds'] = [min_x - lon_padding, min_y - lat_padding, max_x + lon_padding, max_y + lat_padding]
+    return frame
+
+def _extent(group):
+    return [group['minx'].min(), group['miny'].min(), group['maxx'].max(), group['maxy'].max()]
+
+def load_district_centroids(csv_path=CENTROIDS_PATH):
+    """{(state, district): [lat, lon]} from a CSV with NAME_1, NAME_2, latitude and longitude columns"""
+    if csv_path is None or not os.path.exists(csv_path):
+        return {}
+    try:
+        table = pd.read_csv(csv_path, usecols=['NAME_1', 'NAME_2', 'latitude', 'longitude'])
+    except (ValueError, OSError) as e:
+        print(f"⚠️  Could not read district centroids from {csv_path}: {e}")
+        return {}
+
+    table = table.dropna()
+    return {
+        (str(state), str(district)): [float(lat), float(lon)]
+        for state, district, lat, lon in zip(table['NAME_1'], table['NAME_2'], table['latitude'], table['longitude'])
+    }
+
+def build_filter_metadata(gdf, state_column='NAME_1', district_column='NAME_2', all_states="All States",
+                          centroids=None):
+    """Sorted states, {state: sorted districts} and frames of every state and (state, district) in gdf"""
+    metadata = {'states': [], 'districts': {all_states: []}, 'frames': {}, 'district_frames': {}}
+    has_states = state_column in gdf.columns
+    has_districts = district_column in gdf.columns
+    if has_states:
+        metadata['states'] = _sorted_names(gdf[state_column].unique())
+    if has_districts:
+        metadata['districts'][all_states] = _sorted_names(gdf[district_column].unique())
+        if has_states:
+            for state, districts in gdf.groupby(state_column)[district_column]:
+                metadata['districts'][str(state)] = _sorted_names(districts.unique())
+
+    geometry = gdf.geometry
+    if geometry.crs is not None and geometry.crs.to_epsg() != 4326:
+        geometry = geometry.to_crs(epsg=4326)
+    extents = geometry.bounds
+    if has_states:
+        extents['state'] = _name_strings(gdf[state_column])
+    if has_districts:
+        extents['district'] = _name_strings(gdf[district_column])
+    extents = extents.dropna(subset=['minx', 'miny', 'maxx', 'maxy'])
+    if extents.empty:
+        return metadata
+
+    metadata['frames'][all_states] = _frame(_extent(extents), whole_country=True)
+    if not has_states:
+        return metadata
+    for state, group in extents.groupby('state'):
+        metadata['frames'][state] = _frame(_extent(group))
+    if not has_districts:
+        return metadata
+
+    centroids = centroids or {}
+    district_extents = extents.groupby(['state', 'district'])
+    missing = [key for key in district_extents.groups if key not in centroids]
+    if missing:
+        # Not in the centroid table: the centroid in Web Mercator, as the district view used to compute it
+        missing_rows = pd.MultiIndex.from_frame(extents[['state', 'district']]).isin(missing)
+        projected = geometry.loc[extents.index[missing_rows]].to_crs(epsg=3857).centroid.to_crs(epsg=4326)
+        centroids = dict(centroids)
+        for key, point in zip(zip(extents['state'][missing_rows], extents['district'][missing_rows]), projected):
+            centroids.setdefault(key, [point.y, point.x])
+
+    for key, group in district_extents:
+        frame = _frame(_extent(group), center=centroids.get(key))
+        frame['fit_bounds'] = frame['bounds']
+        metadata['district_frames'][key] = frame
+    return metadata
+
+def district_options(metadata, selected_state):
+    """Sorted districts of a state (of the whole country for All States)"""
+    return metadata['districts'].get(str(selected_state), [])
+
+def view_frame(metadata, selected_state):
+    """Precomputed frame of a whole-state (or national) view, or None"""
+    return metadata['frames'].get(str(selected_state))
+
+def district_frame(metadata, state_name, district_name):
+    """Precomputed frame of a district view, or None"""
+    return metadata['district_frames'].get((str(state_name), str(district_name)))
@@ -0,0 +1,51 @@
+import geopandas as gpd
+import shapely
+
+# Multi-resolution district geometry, one level per zoom the dashboard uses (4 for
+# All States, 6-9 for states), simplified from the full-detail layer.
+
+PYRAMID_ZOOMS = [4, 6, 7, 8, 9]
+
+def zoom_tolerance(zoom):
+    """Simplification tolerance in degrees: half a screen pixel at the zoom level"""
+    return 360 / (256 * 2 ** zoom) / 2
+
+def coverage_problem(geometries):
+    """Why the polygons can't be simplified together (GEOS too old, or not a valid coverage), or None if they can"""
+    if not hasattr(shapely, 'coverage_simplify'):
+        return f"GEOS {shapely.geos_version_string} has no coverage simplification (needs 3.12+)"
+    try:
+        if not shapely.coverage_is_valid(geometries):
+            return "the polygons overlap or their shared edges don't match"
+    except shapely.errors.GEOSException as e:
+        return str(e)
+    return None
+
+def simplify_coverage_levels(geometries, tolerances):
+    """The polygons simplified at each tolerance, together so shared edges stay shared (no slivers or gaps)"""
+    problem = coverage_problem(geometries)
+    if problem is None:
+        try:
+            return [shapely.coverage_simplify(geometries, tolerance) for tolerance in tolerances]
+        except shapely.errors.GEOSException as e:
+            problem = str(e)
+    print(f"⚠️  Simplifying polygons one by one, which can leave gaps and slivers between neighbours: {problem}")
+    return [shapely.simplify(geometries, tolerance, preserve_topology=True) for tolerance in tolerances]
+
+def simplify_coverage(geometries, tolerance):
+    """simplify_coverage_levels at a single tolerance"""
+    return simplify_coverage_levels(geometries, [tolerance])[0]
+
+def build_geometry_pyramid(gdf, zooms=PYRAMID_ZOOMS):
+    """Return {zoom: GeoSeries in EPSG:4326} aligned to gdf's index; gdf should be the unsimplified layer"""
+    gdf_wgs = gdf.to_crs(epsg=4326) if gdf.crs is not None and gdf.crs.to_epsg() != 4326 else gdf
+    zooms = sorted(zooms)
+    levels = simplify_coverage_levels(gdf_wgs.geometry.to_numpy(), [zoom_tolerance(zoom) for zoom in zooms])
+    return {zoom: gpd.GeoSeries(level, index=gdf_wgs.index, crs=gdf_wgs.crs) for zoom, level in zip(zooms, levels)}
+
+def select_level(pyramid, zoom):
+    """Coarsest level that is still detailed enough for the zoom (finest level past the top)"""
+    for level_zoom in sorted(pyramid):
+        if level_zoom >= zoom:
+            return pyramid[level_zoom]
+    return pyramid[max(pyramid)]
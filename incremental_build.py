@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import pandas as pd
+
+from merge_engine import district_keys
+
+# Build manifest and .dbf patching for --incremental runs of
+# create_new_shapefile_data.py and quick_shapefile_data_merger.py.
+
+try:
+    import pyogrio
+except ImportError:
+    pyogrio = None
+
+MANIFEST_PATH = 'build_manifest.json'
+INCREMENTAL_FLAG = '--incremental'
+DBF_FIELD_NAME_LENGTH = 10
+
+def is_incremental(argv=None):
+    """True when the script was started with --incremental"""
+    return INCREMENTAL_FLAG in (sys.argv if argv is None else argv)
+
+def file_fingerprint(path):
+    """sha256 of a file's bytes, or None if it does not exist"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def config_fingerprint(config):
+    """Fingerprint of JSON-serializable build settings (column mappings etc.)"""
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+def row_fingerprints(df, key_column='District'):
+    """{district_key: fingerprint} over every row of df, duplicates of a key combined in order"""
+    row_hashes = pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+    fingerprints = {}
+    for key, row_hash in zip(district_keys(df[key_column]), row_hashes):
+        fingerprints[key] = fingerprints.get(key, '') + format(int(row_hash), '016x')
+    return fingerprints
+
+def changed_keys(old_fingerprints, new_fingerprints):
+    """District keys that were added, removed or whose rows changed"""
+    old_fingerprints = old_fingerprints or {}
+    keys = set(old_fingerprints) | set(new_fingerprints)
+    return {key for key in keys if old_fingerprints.get(key) != new_fingerprints.get(key)}
+
+def load_manifest(path=MANIFEST_PATH):
+    """Read the build manifest, or an empty one"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Write the build manifest atomically"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def describe_inputs(input_paths, config=None):
+    """Manifest entry for an output: input file fingerprints plus build settings"""
+    return {
+        'inputs': {path: file_fingerprint(path) for path in input_paths},
+        'config': config_fingerprint(config)
+    }
+
+def manifest_key(writer, output_path):
+    """Manifest key of an output as written by one script (both scripts write district_text_data.csv)"""
+    return f"{writer}:{output_path}"
+
+def record_output(manifest, key, output_path, entry):
+    """Record entry for an output just written, with a fingerprint of the file itself"""
+    manifest[key] = dict(entry, output=file_fingerprint(output_path))
+
+def is_up_to_date(manifest, key, output_path, entry):
+    """True if output_path is still the file recorded under key, built from exactly these inputs and settings"""
+    recorded = manifest.get(key)
+    return (recorded is not None
+            and recorded.get('inputs') == entry['inputs'] and recorded.get('config') == entry['config']
+            and recorded.get('output') == file_fingerprint(output_path))
+
+def can_patch_attributes():
+    """Rewriting only the .dbf needs pyogrio; without it the merger does a full rebuild"""
+    return pyogrio is not None
+
+def patch_attribute_table(shapefile_path, patch):
+    """Overwrite the rows of a shapefile's .dbf that share patch's index, leaving .shp/.shx untouched"""
+    attributes = pyogrio.read_dataframe(shapefile_path, read_geometry=False)
+
+    for column in patch.columns:
+        # Shapefile field names are cut to 10 characters when written
+        field = column[:DBF_FIELD_NAME_LENGTH]
+        if field not in attributes.columns:
+            attributes[field] = None
+        attributes[field] = attributes[field].astype(object)
+        attributes.loc[patch.index, field] = [None if pd.isna(value) else str(value) for value in patch[column]]
+
+    # Write next to the target and swap in, so the layer is never half-written
+    dbf_path = os.path.splitext(shapefile_path)[0] + '.dbf'
+    tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(dbf_path) or '.')
+    try:
+        tmp_path = os.path.join(tmp_dir, os.path.basename(dbf_path))
+        pyogrio.write_dataframe(attributes, tmp_path, driver='ESRI Shapefile')
+        os.replace(tmp_path, dbf_path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return attributes
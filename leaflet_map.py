@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit.components.v1 as components
+
+# Streamlit component that draws the suitability map in a static Leaflet page
+# (leaflet_map_frontend/index.html); map data is fetched from files served next to it.
+
+FRONTEND_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'leaflet_map_frontend')
+# Served by Streamlit with the page, so the browser fetches (and caches) them by URL
+DATA_PATH = os.path.join(FRONTEND_PATH, 'data')
+DATA_FILE_LIMIT = 256
+# Other app processes sharing the checkout write here too: only files nobody has
+# published or reused for this long are pruned, so no page loses a file it points to
+DATA_FILE_GRACE = 24 * 3600
+DEFAULT_COLOR = '#757575'  # Grey for unknown values
+
+_leaflet_component = components.declare_component('leaflet_map', path=FRONTEND_PATH)
+_data_urls = OrderedDict()
+_data_urls_lock = threading.Lock()
+
+def build_color_tables(objectives, get_category_colors, get_ranking_color_gradient):
+    """{objective: {class: color}} with category colors taking precedence over ranking colors"""
+    ranking_colors = get_ranking_color_gradient()
+    return {objective: {**ranking_colors, **get_category_colors(objective)} for objective in objectives}
+
+def _prune_data_files():
+    """Remove the oldest data files beyond DATA_FILE_LIMIT that are past the grace period"""
+    try:
+        paths = [os.path.join(DATA_PATH, name) for name in os.listdir(DATA_PATH) if name.endswith('.json')]
+        paths.sort(key=os.path.getmtime)
+        expired = time.time() - DATA_FILE_GRACE
+        for path in paths[:-DATA_FILE_LIMIT]:
+            if os.path.getmtime(path) < expired:
+                os.remove(path)
+    except OSError:
+        pass
+
+def published_url(url):
+    """url if its data file is still there (marked as in use, so no process prunes it), else None"""
+    if url is None:
+        return None
+    try:
+        os.utime(os.path.join(FRONTEND_PATH, url))
+    except OSError:
+        return None
+    return url
+
+def publish_map_data(key, build_content):
+    """Page-relative URL of a file holding build_content() (named by its hash, written once per key), or None if it can't be written"""
+    with _data_urls_lock:
+        url = _data_urls.get(key)
+        if url is not None:
+            _data_urls.move_to_end(key)
+    url = published_url(url)
+    if url is not None:
+        return url
+
+    content = build_content().encode('utf-8')
+    name = f"{hashlib.sha256(content).hexdigest()[:32]}.json"
+    path = os.path.join(DATA_PATH, name)
+    try:
+        os.utime(path)
+    except OSError:
+        tmp_path = None
+        try:
+            os.makedirs(DATA_PATH, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=DATA_PATH, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Read-only deployment: the caller sends the data inline instead
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+        _prune_data_files()
+
+    url = f"data/{name}"
+    with _data_urls_lock:
+        _data_urls[key] = url
+        _data_urls.move_to_end(key)
+        while len(_data_urls) > DATA_FILE_LIMIT:
+            _data_urls.popitem(last=False)
+    return url
+
+def publish_view_data(payload_key, class_codes, payload=None):
+    """URL of a view's districts' classes (and GeoJSON), or None if they can't be published"""
+    return publish_map_data(
+        ('view', str(payload_key)),
+        lambda: '{"class_codes":%s,"payload":%s}' % (json.dumps(class_codes, separators=(',', ':')), payload or 'null')
+    )
+
+def publish_boundary_data(boundary_key, boundary):
+    """URL of the boundary GeoJSON, or None if it can't be published"""
+    return publish_map_data(('boundary', str(boundary_key)), lambda: boundary)
+
+def render_leaflet_map(payload_key, objective, objectives, colors, center, zoom, view_url=None, class_codes=None,
+                       payload=None, tile_url=None, tile_layer=None, bounds=None, boundary_url=None, boundary=None,
+                       boundary_tile_url=None, boundary_tile_layer=None, boundary_key=None, max_native_zoom=14,
+                       height=400, key='suitability_map'):
+    """Show the districts styled by objective in the cached Leaflet page; returns the last objective and point picked on the map"""
+    # The districts' classes (and GeoJSON) and the boundary travel as files named by content (see
+    # publish_view_data), which the browser caches, or inline; neither when the map already has them
+    return _leaflet_component(
+        payload_key=str(payload_key),
+        view_url=view_url,
+        class_codes=class_codes,
+        payload=payload,
+        objective=objective,
+        objectives=[[name, label] for name, label in objectives.items()],
+        colors=colors,
+        default_color=DEFAULT_COLOR,
+        center=[float(center[0]), float(center[1])],
+        zoom=int(zoom),
+        tile_url=tile_url,
+        tile_layer=tile_layer,
+        bounds=[float(value) for value in bounds] if bounds is not None else None,
+        boundary_url=boundary_url,
+        boundary=boundary,
+        boundary_tile_url=boundary_tile_url,
+        boundary_tile_layer=boundary_tile_layer,
+        boundary_key=str(boundary_key) if boundary_key is not None else None,
+        max_native_zoom=max_native_zoom,
+        height=height,
+        key=key,
+        default=None
+    )
@@ -0,0 +1,86 @@
+import base64
+import json
+import math
+
+import numpy as np
+import pandas as pd
+import shapely
+
+# Minimal GeoJSON payloads for the map layers: an id, at most one property and
+# coordinates rounded for the zoom level.
+
+MISSING_CLASS_CODE = 255
+
+def coordinate_precision(zoom):
+    """Decimal places of a degree needed for sub-pixel accuracy at a zoom level"""
+    degrees_per_pixel = 360 / (256 * 2 ** zoom)
+    return max(0, math.ceil(-math.log10(degrees_per_pixel)))
+
+def view_zoom_level(bounds, whole_country=False):
+    """Initial zoom of a national/state view: 4 for the whole country, else by the view's extent"""
+    if whole_country:
+        return 4
+
+    lat_diff = bounds[3] - bounds[1]
+    lon_diff = bounds[2] - bounds[0]
+    if lat_diff > 8 or lon_diff > 8:
+        return 6
+    elif lat_diff > 3 or lon_diff > 3:
+        return 7
+    elif lat_diff > 1 or lon_diff > 1:
+        return 8
+    return 9
+
+def quantize_geometries(geometries, precision):
+    """Round every coordinate to the given number of decimal places"""
+    return shapely.transform(geometries, lambda coords: np.round(coords, precision))
+
+def build_map_payload(gdf, category, zoom, geometries=None):
+    """Serialize id, the category property and quantized geometry as a GeoJSON string"""
+    # geometries may replace gdf's own (e.g. a pyramid level in EPSG:4326, aligned to gdf)
+    if geometries is None:
+        if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+            gdf = gdf.to_crs(epsg=4326)
+        geometries = gdf.geometry
+
+    geometries = quantize_geometries(geometries.to_numpy(), coordinate_precision(zoom))
+    geometry_json = shapely.to_geojson(geometries)
+
+    if category is not None and category in gdf.columns:
+        values = [None if pd.isna(value) else str(value) for value in gdf[category].astype(object)]
+    else:
+        values = None
+
+    features = []
+    for position, (feature_id, geometry) in enumerate(zip(gdf.index, geometry_json)):
+        if geometry is None:
+            continue
+        properties = {category: values[position]} if values is not None else {}
+        features.append(
+            '{"type":"Feature","id":%s,"properties":%s,"geometry":%s}'
+            % (json.dumps(str(feature_id)), json.dumps(properties, separators=(',', ':')), geometry)
+        )
+
+    return '{"type":"FeatureCollection","features":[%s]}' % ','.join(features)
+
+def mapped_rows(geometries):
+    """Mask of the rows build_map_payload emits a feature for (those with a geometry)"""
+    return ~shapely.is_missing(geometries.to_numpy())
+
+def build_class_codes(gdf, categories, rows=None):
+    """{'classes': [...], 'codes': {category: base64 bytes}}: one byte per row, an index into classes"""
+    categories = [col for col in categories if col in gdf.columns]
+    if rows is not None:
+        gdf = gdf[rows]
+
+    values = {col: gdf[col].astype(object) for col in categories}
+    classes = sorted({str(value) for col_values in values.values() for value in col_values if not pd.isna(value)})
+    if len(classes) >= MISSING_CLASS_CODE:
+        raise ValueError(f"{len(classes)} classes do not fit in one byte")
+    class_codes = {name: code for code, name in enumerate(classes)}
+
+    codes = {}
+    for col, col_values in values.items():
+        encoded = bytes(MISSING_CLASS_CODE if pd.isna(value) else class_codes[str(value)] for value in col_values)
+        codes[col] = base64.b64encode(encoded).decode('ascii')
+    return {'classes': classes, 'codes': codes}
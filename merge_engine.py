@@ -0,0 +1,56 @@
+import pandas as pd
+
+from data_cleaning import normalize_name
+
+# Keyed joins for the shapefile data merger: each source table is reindexed onto
+# the shapefile rows by normalized district key in one pass.
+
+INVALID_VALUES = ['', 'N/A', 'nan']
+
+def district_keys(names):
+    """Normalized join keys for a Series of district names ('' for missing names)"""
+    return names.map(lambda name: '' if pd.isna(name) else normalize_name(name))
+
+def valid_value_mask(values, invalid_values=INVALID_VALUES):
+    """True where a value is present and not a placeholder like 'N/A'"""
+    return values.notna() & ~values.astype(str).str.strip().isin(invalid_values)
+
+def join_source(gdf, source, columns, district_column='NAME_2', source_column='District'):
+    """Return (columns of source aligned to gdf's index, mask of gdf rows whose district matched)"""
+    columns = list(dict.fromkeys(col for col in columns if col in source.columns))
+    # object dtype so integer columns keep their values as-is when unmatched rows become NaN
+    keyed = source[columns].astype(object)
+    keyed.index = district_keys(source[source_column])
+    keyed = keyed[keyed.index != '']
+    keyed = keyed[~keyed.index.duplicated(keep='last')]
+
+    keys = district_keys(gdf[district_column])
+    joined = keyed.reindex(keys.to_numpy())
+    joined.index = gdf.index
+    return joined, pd.Series(keys.isin(keyed.index).to_numpy(), index=gdf.index)
+
+def merge_columns(gdf, source, mappings, district_column='NAME_2', source_column='District',
+                  default=None, validate=True):
+    """Copy source columns onto gdf under their mapped names; return a per-column match report"""
+    joined, matched = join_source(gdf, source, mappings.keys(), district_column, source_column)
+
+    report = []
+    for orig_col, target_col in mappings.items():
+        if orig_col not in joined.columns:
+            report.append({'source': orig_col, 'target': target_col, 'matched': 0, 'missing': True})
+            continue
+
+        values = joined[orig_col]
+        filled = matched & valid_value_mask(values) if validate else matched
+        gdf[target_col] = values.where(filled, default)
+        report.append({'source': orig_col, 'target': target_col, 'matched': int(filled.sum()), 'missing': False})
+
+    return pd.DataFrame(report, columns=['source', 'target', 'matched', 'missing'])
+
+def print_match_report(report, total):
+    """Print one line per mapped column with how many districts received a value"""
+    for row in report.itertuples(index=False):
+        if row.missing:
+            print(f"  ⚠️  Column '{row.source}' not found -> {row.target} left empty")
+        else:
+            print(f"  ✅ {row.source} -> {row.target}: {row.matched}/{total} districts matched")
@@ -0,0 +1,39 @@
+# Shapefile columns behind the dashboard's Key Parameters, shared by the apps
+# and site_scoring.py (which can't import the Streamlit apps).
+
+# Parameter mappings for National/State level (exact column names from shapefile)
+NATIONAL_PARAMETER_MAPPING = {
+    "Solar Irradiance": "2Solar_Irr",
+    "Cropping Intensity(%)": "2CropInten", 
+    "Irrigation Intensity (%)": "2IrriInten",
+    "IWU (% of CWU)": "2IWU_CWU",
+    "Elect(%)": "2Elect",
+    "GW_dev_stage (%)": "2GW_dev",
+    "Surface water area (km2)-%": "2SWArea",
+    "Cultivated land (%)": "2Cul-Land",
+    "Electricity Subsidy": "2El.Subsid",  # Fixed: exact name from shapefile
+    "GW share irr (% of IWU)": "2GW_share",
+    "WL (m)": "2WL_m",
+    "Small& Marginal % Holdings": "2S_M_Holds"
+}
+
+# Parameter mappings for District level (exact column names from shapefile)
+DISTRICT_PARAMETER_MAPPING = {
+    "Cultivated land (%)": "1Cult_land",  # Fixed: was 1Cult_land1
+    "Cropping Intensity(%)": "1Crop_Int",
+    "Irrigation Coverage (%)": "1Irrig_Int",  # Fixed: was 1Irrig_Inte
+    "Irrigation Water Requirement (% of CWU)": "1IWU",
+    "GW irrigation (%)": "1GW_Irr_Sh",
+    "GW development (%)": "1GW_Dev",
+    "SW bodies (#)": "1no_of_SWB",
+    "SW bodies (% of district area)": "1SW_body",
+    "Electric pumps (%)": "1ElectPtg",
+    "Diesel pumps (%)": "1DieselPtg",
+    "Electricity Tariff (paisa/kWH)": "1el_Tariff",
+    "Small& Marginal Holdings (%)": "1S_M_Hold",
+    "Avg. farmer area (ha)": "1ALLGrps",
+    "Avg. number of parcels": "1ALLGrpsNo",
+    "DISCOM Name": "1DISCOMNam",
+    "DISCOM Rating": "1DISCOMRat",
+    "Feeder segregation": "1Feederseg"
+}
@@ -0,0 +1,50 @@
+import math
+from functools import lru_cache
+
+# Summary Statistics pie chart as inline SVG, memoized on its percentages.
+
+CHART_SIZE = 252  # 3.5in at 72pt, the size of the old figure
+CHART_RADIUS = 110
+BACKGROUND_COLOR = '#2C3E50'
+LABEL_DISTANCE = 0.6
+LABEL_FONT_SIZE = 8
+START_ANGLE = 90
+
+def _point(angle, radius):
+    center = CHART_SIZE / 2
+    return center + radius * math.cos(math.radians(angle)), center - radius * math.sin(math.radians(angle))
+
+@lru_cache(maxsize=1024)
+def build_pie_svg(percentages, colors):
+    """SVG markup of a pie chart for a tuple of percentages and a tuple of matching fill colors"""
+    total = sum(percentages)
+    center = CHART_SIZE / 2
+    shapes = []
+    labels = []
+
+    angle = START_ANGLE
+    for percentage, color in zip(percentages, colors):
+        sweep = 360 * percentage / total if total > 0 else 0
+        if sweep >= 359.999:
+            shapes.append(f'<circle cx="{center:.2f}" cy="{center:.2f}" r="{CHART_RADIUS}" fill="{color}"/>')
+        elif sweep > 0:
+            start_x, start_y = _point(angle, CHART_RADIUS)
+            end_x, end_y = _point(angle + sweep, CHART_RADIUS)
+            large_arc = 1 if sweep > 180 else 0
+            shapes.append(
+                f'<path d="M{center:.2f},{center:.2f} L{start_x:.2f},{start_y:.2f} '
+                f'A{CHART_RADIUS},{CHART_RADIUS} 0 {large_arc} 0 {end_x:.2f},{end_y:.2f} Z" fill="{color}"/>'
+            )
+
+        label_x, label_y = _point(angle + sweep / 2, CHART_RADIUS * LABEL_DISTANCE)
+        labels.append(
+            f'<text x="{label_x:.2f}" y="{label_y:.2f}" fill="white" font-size="{LABEL_FONT_SIZE}" '
+            f'font-weight="bold" text-anchor="middle" dominant-baseline="central">{100 * percentage / total if total > 0 else 0:.1f}%</text>'
+        )
+        angle += sweep
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {CHART_SIZE} {CHART_SIZE}" width="100%" '
+        f'style="background-color: {BACKGROUND_COLOR}; font-family: sans-serif;">'
+        + ''.join(shapes) + ''.join(labels) + '</svg>'
+    )
@@ -1,62 +1,30 @@
+import os
+import subprocess
+import sys
+
 import pandas as pd
 import geopandas as gpd
+from data_bundle import SOURCE_COMPONENTS, build_bundle, get_bundle_path
+from merge_engine import district_keys, merge_columns, print_match_report
+from workbook_ingest import load_source, load_source_tables, source_files, use_workbook
+from incremental_build import (
+    can_patch_attributes, changed_keys, describe_inputs, is_incremental, is_up_to_date,
+    load_manifest, manifest_key, patch_attribute_table, record_output, row_fingerprints, save_manifest
+)
 
-print("=== Working Data Merger ===")
-
-# Load files
-print("Loading files...")
-gdf = gpd.read_file('Shapefiles/true_solar_suitability.shp')
-country_data = pd.read_csv('Country_State_Param_Values.csv')
-rankings = pd.read_csv('Solar_new_ranking.csv')
-
-try:
-    district_params = pd.read_csv('District_Param_Values.csv')
-    print(f"✅ District params loaded: {len(district_params)} rows")
-except:
-    print("⚠️  District_Param_Values.csv not found or empty")
-    district_params = pd.DataFrame()
-
-try:
-    district_colnames = pd.read_csv('District_ColNames.csv')
-    print(f"✅ District column names loaded: {len(district_colnames)} rows")
-except:
-    print("⚠️  District_ColNames.csv not found")
-    district_colnames = pd.DataFrame()
-
-print(f"Shapefile: {len(gdf)} districts")
-print(f"Country data: {len(country_data)} rows")
-print(f"Rankings: {len(rankings)} rows")
-
-# STEP 1: Add rankings by district name
-print("\n=== Step 1: Adding Rankings ===")
-rankings_dict = {}
-for _, row in rankings.iterrows():
-    district = row['District']
-    rankings_dict[district] = {
-        'Adapt': row.get('Adapt_new', 'No Data'),
-        'Mitigate': row.get('Mitigate_new', 'No Data'), 
-        'Replace': row.get('Replace_new', 'No Data'),
-        'General_SI': row.get('Combine', 'No Data')
-    }
-
-# Add ranking columns to shapefile
-for col in ['Adapt', 'Mitigate', 'Replace', 'General_SI']:
-    gdf[col] = 'No Data'
-
-ranking_matches = 0
-for idx, row in gdf.iterrows():
-    district = row['NAME_2']
-    if district in rankings_dict:
-        gdf.at[idx, 'Adapt'] = rankings_dict[district]['Adapt']
-        gdf.at[idx, 'Mitigate'] = rankings_dict[district]['Mitigate']
-        gdf.at[idx, 'Replace'] = rankings_dict[district]['Replace']
-        gdf.at[idx, 'General_SI'] = rankings_dict[district]['General_SI']
-        ranking_matches += 1
+base_path = 'Shapefiles/true_solar_suitability.shp'
+output_path = 'Shapefiles/true_solar_suitability_with_data.shp'
+text_output_path = 'district_text_data.csv'
+warmup_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'warmup.py')
 
-print(f"✅ Rankings added: {ranking_matches} districts matched")
+# Ranking columns (source -> shapefile)
+ranking_mappings = {
+    'Adapt_new': 'Adapt',
+    'Mitigate_new': 'Mitigate',
+    'Replace_new': 'Replace',
+    'Combine': 'General_SI'
+}
 
-# STEP 2: Add Country/State level data
-print("\n=== Step 2: Adding Country/State Data ===")
 # Exact column mappings from your files
 country_mappings = {
     'Solar Irradiance': '2Solar_Irra',
@@ -73,41 +41,6 @@ country_mappings = {
     'Small& Marginal % Holdings': '2S_M_Holds'
 }
 
-# Create district lookup from country data
-country_dict = {}
-for _, row in country_data.iterrows():
-    district = row['District']
-    country_dict[district] = row.to_dict()
-
-print(f"Available columns in country data: {list(country_data.columns)}")
-print(f"Sample district data: {list(country_dict.keys())[:5]}")
-
-# Add country-level columns
-for orig_col, qgis_col in country_mappings.items():
-    print(f"Processing {orig_col} -> {qgis_col}")
-    
-    if orig_col not in country_data.columns:
-        print(f"  ⚠️  Column '{orig_col}' not found in country data")
-        continue
-        
-    gdf[qgis_col] = None
-    
-    matched = 0
-    for idx, row in gdf.iterrows():
-        district = row['NAME_2']
-        if district in country_dict:
-            value = country_dict[district][orig_col]
-            if pd.notna(value) and str(value).strip() not in ['', 'N/A', 'nan']:
-                gdf.at[idx, qgis_col] = value
-                matched += 1
-    
-    print(f"  ✅ {matched} districts matched for {orig_col}")
-
-print(f"✅ Country/State data added: {len(country_mappings)} columns processed")
-
-# STEP 3: Add District level data (hardcoded mappings)
-print("\n=== Step 3: Adding District Data ===")
-
 # Hardcoded district column mappings
 district_mappings = {
     'Cultivated land (%)': '1Cult_land1',
@@ -139,68 +72,130 @@ text_columns = [
     'Text-Model'
 ]
 
+print("=== Working Data Merger ===")
+
+# Load files (straight from the workbook when available; --csv uses the CSV exports)
+print("Loading files...")
+from_workbook = use_workbook()
+source_tables = load_source_tables() if from_workbook else None
+if from_workbook:
+    print("✅ Source sheets streamed from the workbook")
+country_data = load_source('Country_State_Param_Values.csv', source_tables)
+rankings = load_source('Solar_new_ranking.csv', source_tables)
+
+try:
+    district_params = load_source('District_Param_Values.csv', source_tables)
+    print(f"✅ District params loaded: {len(district_params)} rows")
+except:
+    print("⚠️  District_Param_Values.csv not found or empty")
+    district_params = pd.DataFrame()
+
+try:
+    district_colnames = pd.read_csv('District_ColNames.csv')
+    print(f"✅ District column names loaded: {len(district_colnames)} rows")
+except:
+    print("⚠️  District_ColNames.csv not found")
+    district_colnames = pd.DataFrame()
+
+# Incremental mode: compare input files and source rows with the last build
+incremental = is_incremental()
+manifest = load_manifest()
+shapefile_key = manifest_key('quick_shapefile_data_merger.py', output_path)
+text_key = manifest_key('quick_shapefile_data_merger.py', text_output_path)
+code_inputs = ['quick_shapefile_data_merger.py', 'merge_engine.py']
+shapefile_entry = describe_inputs(
+    [os.path.splitext(base_path)[0] + ext for ext in SOURCE_COMPONENTS] + code_inputs,
+    config={'rankings': ranking_mappings, 'country': country_mappings, 'district': district_mappings}
+)
+text_entry = describe_inputs(source_files(['District_Param_Values.csv'], from_workbook) + code_inputs, config=text_columns)
+source_rows = {
+    'Solar_new_ranking.csv': row_fingerprints(rankings),
+    'Country_State_Param_Values.csv': row_fingerprints(country_data),
+    'District_Param_Values.csv': row_fingerprints(district_params) if 'District' in district_params.columns else {}
+}
+
+changed_districts = None  # None means a full rebuild
+if incremental and can_patch_attributes() and is_up_to_date(manifest, shapefile_key, output_path, shapefile_entry):
+    recorded_rows = manifest[shapefile_key].get('rows', {})
+    changed_districts = set()
+    for source, fingerprints in source_rows.items():
+        changed_districts |= changed_keys(recorded_rows.get(source), fingerprints)
+skip_text = incremental and is_up_to_date(manifest, text_key, text_output_path, text_entry)
+
+if changed_districts is not None and not changed_districts and skip_text:
+    print("✅ All outputs are up to date, nothing to rebuild")
+    sys.exit(0)
+
+if changed_districts is None:
+    gdf = gpd.read_file(base_path)
+else:
+    # Only the attribute rows of changed districts are merged and patched
+    base_attributes = gpd.read_file(base_path, ignore_geometry=True)
+    gdf = base_attributes[district_keys(base_attributes['NAME_2']).isin(changed_districts)].copy()
+    print(f"Incremental build: {len(changed_districts)} changed districts, {len(gdf)} shapefile rows to patch")
+
+print(f"Shapefile: {len(gdf)} districts")
+print(f"Country data: {len(country_data)} rows")
+print(f"Rankings: {len(rankings)} rows")
+
+# STEP 1: Add rankings by district name
+print("\n=== Step 1: Adding Rankings ===")
+
+# Add ranking columns to shapefile
+for col in ranking_mappings.values():
+    gdf[col] = 'No Data'
+
+ranking_report = merge_columns(gdf, rankings, ranking_mappings, default='No Data', validate=False)
+print_match_report(ranking_report, len(gdf))
+
+# STEP 2: Add Country/State level data
+print("\n=== Step 2: Adding Country/State Data ===")
+
+print(f"Available columns in country data: {list(country_data.columns)}")
+
+# One keyed join for all country-level columns
+country_report = merge_columns(gdf, country_data, country_mappings)
+print_match_report(country_report, len(gdf))
+
+print(f"✅ Country/State data added: {len(country_mappings)} columns processed")
+
+# STEP 3: Add District level data (hardcoded mappings)
+print("\n=== Step 3: Adding District Data ===")
+
 if not district_params.empty:
     print("Processing district-level data...")
     print(f"Available columns in district data: {list(district_params.columns)}")
     
-    # Create district lookup
-    district_dict = {}
-    for _, row in district_params.iterrows():
-        district = row.get('District', '')
-        if district:
-            district_dict[district] = row.to_dict()
-    
-    print(f"District data has {len(district_dict)} districts")
-    
-    # Process district numerical columns
-    numerical_added = 0
-    
-    for orig_col, qgis_col in district_mappings.items():
-        print(f"Processing {orig_col} -> {qgis_col}")
-        
-        if orig_col not in district_params.columns:
-            print(f"  ⚠️  Column '{orig_col}' not found in district data")
-            continue
-            
-        gdf[qgis_col] = None
-        
-        matched = 0
-        for idx, gdf_row in gdf.iterrows():
-            district = gdf_row['NAME_2']
-            if district in district_dict:
-                value = district_dict[district][orig_col]
-                if pd.notna(value) and str(value).strip() not in ['', 'N/A', 'nan']:
-                    gdf.at[idx, qgis_col] = value
-                    matched += 1
-        
-        print(f"  ✅ {matched} districts matched for {orig_col}")
-        numerical_added += 1
+    # One keyed join for all district numerical columns
+    district_report = merge_columns(gdf, district_params, district_mappings)
+    print_match_report(district_report, len(gdf))
+    numerical_added = int((~district_report['missing']).sum())
     
     print(f"✅ District numerical data: {numerical_added} columns processed")
     
     # Create text CSV
-    print(f"\n=== Creating Text CSV ===")
-    text_data = []
-    for _, row in district_params.iterrows():
-        text_row = {'District': row.get('District', '')}
+    if skip_text:
+        print(f"\n⏭️  {text_output_path} is up to date, skipped")
+    else:
+        print(f"\n=== Creating Text CSV ===")
+        text_df = pd.DataFrame({'District': district_params.get('District', pd.Series('', index=district_params.index))})
         for col in text_columns:
             if col in district_params.columns:
-                value = row[col]
-                text_row[col] = str(value).strip() if pd.notna(value) and str(value).strip() not in ['N/A', 'nan', 'null'] else ''
+                values = district_params[col]
+                stripped = values.astype(str).str.strip()
+                text_df[col] = stripped.where(values.notna() & ~stripped.isin(['N/A', 'nan', 'null']), '')
             else:
-                text_row[col] = ''
+                text_df[col] = ''
                 print(f"  ⚠️  Text column '{col}' not found")
-        text_data.append(text_row)
     
-    text_df = pd.DataFrame(text_data)
-    text_df.to_csv('district_text_data.csv', index=False)
-    print(f"✅ Text CSV created with {len(text_columns)} text columns")
+        text_df.to_csv('district_text_data.csv', index=False)
+        print(f"✅ Text CSV created with {len(text_columns)} text columns")
     
-    # Show text data completeness
-    for col in text_columns:
-        if col in text_df.columns:
-            non_empty = (text_df[col] != '').sum()
-            print(f"  {col}: {non_empty} districts have text")
+        # Show text data completeness
+        for col in text_columns:
+            if col in text_df.columns:
+                non_empty = (text_df[col] != '').sum()
+                print(f"  {col}: {non_empty} districts have text")
     
 else:
     print("⚠️  District data not available - using country data only")
@@ -213,9 +208,36 @@ else:
 
 # Save the final shapefile
 print("\n=== Saving Files ===")
-output_path = 'Shapefiles/true_solar_suitability_with_data.shp'
-gdf.to_file(output_path)
-print(f"✅ Shapefile saved to: {output_path}")
+shapefile_changed = changed_districts is None or len(gdf) > 0
+if changed_districts is None:
+    gdf.to_file(output_path)
+    print(f"✅ Shapefile saved to: {output_path}")
+elif len(gdf) > 0:
+    # Geometry is unchanged, so only the attribute table (.dbf) is rewritten
+    gdf = patch_attribute_table(output_path, gdf)
+    print(f"✅ Patched {len(changed_districts)} districts in: {output_path}")
+else:
+    gdf = gpd.read_file(output_path, ignore_geometry=True)
+    print(f"⏭️  {output_path} is up to date, skipped")
+
+# Precompile the columnar bundle the dashboard loads instead of the shapefile
+if shapefile_changed:
+    build_bundle(output_path)
+    print(f"✅ Data bundle saved to: {get_bundle_path(output_path)}")
+    
+    # Pre-render every (state, objective) view; warmup.py runs its own process pool
+    warmup = subprocess.run([sys.executable, warmup_script, output_path], check=False)
+    if warmup.returncode != 0:
+        print(f"⚠️  warmup.py failed (exit code {warmup.returncode}); views will be rendered on demand")
+
+# Record what this build was made from for the next --incremental run;
+# a build whose warm-up failed is left unrecorded so the next run redoes it
+if not shapefile_changed or warmup.returncode == 0:
+    record_output(manifest, shapefile_key, output_path, dict(shapefile_entry, rows=source_rows))
+else:
+    manifest.pop(shapefile_key, None)
+record_output(manifest, text_key, text_output_path, text_entry)
+save_manifest(manifest)
 
 # Final check
 print("\n=== Final Results ===")
@@ -0,0 +1,45 @@
+import numpy as np
+
+# Row positions of every state and district, for filtered views that don't copy the layer.
+
+ALL_STATES = "All States"
+ALL_DISTRICTS = "All Districts"
+
+def _rows(positions):
+    """A slice when the positions are one contiguous run, otherwise the position array"""
+    positions = np.asarray(positions, dtype=np.int64)
+    if len(positions) > 0 and positions[-1] - positions[0] + 1 == len(positions):
+        return slice(int(positions[0]), int(positions[-1]) + 1)
+    return positions
+
+def build_selection_index(gdf, state_column='NAME_1', district_column='NAME_2'):
+    """Row positions of every state, district name and (state, district) pair in gdf"""
+    index = {'states': {}, 'districts': {}, 'state_districts': {}}
+    if state_column in gdf.columns:
+        for state, positions in gdf.groupby(state_column, sort=False).indices.items():
+            index['states'][str(state)] = _rows(positions)
+    if district_column in gdf.columns:
+        for district, positions in gdf.groupby(district_column, sort=False).indices.items():
+            index['districts'][str(district)] = _rows(positions)
+    if state_column in gdf.columns and district_column in gdf.columns:
+        pairs = gdf.groupby([state_column, district_column], sort=False).indices
+        for (state, district), positions in pairs.items():
+            index['state_districts'][(str(state), str(district))] = _rows(positions)
+    return index
+
+def selected_rows(index, selected_state, selected_district):
+    """Row positions (a slice or an array) of a State / District selection, or None for every row"""
+    if selected_state == ALL_STATES and selected_district == ALL_DISTRICTS:
+        return None
+    if selected_district == ALL_DISTRICTS:
+        rows = index['states'].get(str(selected_state))
+    elif selected_state == ALL_STATES:
+        rows = index['districts'].get(str(selected_district))
+    else:
+        rows = index['state_districts'].get((str(selected_state), str(selected_district)))
+    return rows if rows is not None else slice(0, 0)
+
+def select_view(gdf, index, selected_state, selected_district):
+    """The rows of gdf in a State / District selection, without copying the layer"""
+    rows = selected_rows(index, selected_state, selected_district)
+    return gdf if rows is None else gdf.iloc[rows]
@@ -0,0 +1,83 @@
+import glob
+import os
+
+import geopandas as gpd
+
+from data_bundle import (compute_source_hash, get_bundle_path, load_bundle, read_bundle, read_bundle_info,
+                         simplify_layer, write_bundle)
+from data_cleaning import normalize_missing_values
+
+# Host-wide, memory-mapped geodata cache, on when SOLAR_SHARED_CACHE_DIR is set
+# (e.g. /dev/shm/solar): workers on a host map one Arrow bundle per layer.
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+SHARED_CACHE_ENV = 'SOLAR_SHARED_CACHE_DIR'
+
+def get_shared_cache_dir():
+    """The shared cache directory, or None when the cache is turned off"""
+    return os.environ.get(SHARED_CACHE_ENV) or None
+
+def get_shared_bundle_path(cache_dir, shapefile_path, source_hash):
+    """Path of a layer's bundle inside the shared cache, unique per source hash"""
+    name = os.path.splitext(os.path.basename(shapefile_path))[0]
+    return os.path.join(cache_dir, f"{name}-{source_hash[:16]}.arrow")
+
+def _acquire_lock(lock_file):
+    # Without fcntl (Windows) workers may build the same bundle twice; writes stay atomic
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+def _release_lock(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def populate_shared_bundle(shapefile_path, cache_dir, source_hash):
+    """Write a layer's bundle into the shared cache unless another process already has"""
+    os.makedirs(cache_dir, exist_ok=True)
+    shared_path = get_shared_bundle_path(cache_dir, shapefile_path, source_hash)
+
+    with open(shared_path + '.lock', 'w') as lock_file:
+        _acquire_lock(lock_file)
+        try:
+            # Another worker may have populated it while we were waiting
+            if read_bundle_info(shared_path) is not None:
+                return shared_path
+
+            gdf = load_bundle(shapefile_path)
+            if gdf is not None:
+                tolerance = read_bundle_info(get_bundle_path(shapefile_path)).get('simplify_tolerance', 0.0)
+            else:
+                os.environ['SHAPE_RESTORE_SHX'] = 'YES'
+                gdf, tolerance = simplify_layer(normalize_missing_values(gpd.read_file(shapefile_path)))
+            write_bundle(gdf, shared_path, source_hash, tolerance)
+
+            # Drop bundles of earlier versions of this layer
+            stale_pattern = get_shared_bundle_path(cache_dir, shapefile_path, '*')
+            for stale_path in glob.glob(stale_pattern) + glob.glob(stale_pattern + '.lock'):
+                if not stale_path.startswith(shared_path):
+                    try:
+                        os.remove(stale_path)
+                    except OSError:
+                        pass
+        finally:
+            _release_lock(lock_file)
+
+    return shared_path
+
+def attach_shared_layer(shapefile_path, cache_dir=None):
+    """Map a layer from the shared cache (populating it first if needed), or None if the cache is off"""
+    cache_dir = cache_dir or get_shared_cache_dir()
+    if cache_dir is None:
+        return None
+    source_hash = compute_source_hash(shapefile_path)
+    if source_hash is None:
+        return None
+
+    shared_path = get_shared_bundle_path(cache_dir, shapefile_path, source_hash)
+    if read_bundle_info(shared_path) is None:
+        shared_path = populate_shared_bundle(shapefile_path, cache_dir, source_hash)
+    return read_bundle(shared_path, zero_copy=True)
@@ -0,0 +1,98 @@
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from parameter_mappings import DISTRICT_PARAMETER_MAPPING
+from spatial_index import NAME_COLUMNS, RANKING_COLUMNS, build_spatial_index, lookup_points
+from warmup import load_layer
+
+# Batch scoring of candidate sites: the district, rankings and district parameters at each lat/lon.
+#
+#   python site_scoring.py sites.csv [scored.csv] [shapefile]
+
+CHUNK_SIZE = int(os.environ.get('SOLAR_SCORING_CHUNK_SIZE', '100000'))
+DEFAULT_SHAPEFILE = 'Shapefiles/true_solar_suitability_with_data.shp'
+LATITUDE_COLUMNS = ['latitude', 'lat', 'y']
+LONGITUDE_COLUMNS = ['longitude', 'lon', 'lng', 'long', 'x']
+OUTPUT_COLUMNS = {'NAME_1': 'State', 'NAME_2': 'District'}
+
+def build_site_scorer(gdf):
+    """Spatial index over the districts carrying the names, rankings and district parameters"""
+    parameter_columns = list(DISTRICT_PARAMETER_MAPPING.values())
+    return build_spatial_index(gdf, NAME_COLUMNS + RANKING_COLUMNS + parameter_columns)
+
+def find_column(columns, candidates):
+    """The first column whose name matches a candidate (case-insensitive), or None"""
+    by_name = {str(column).strip().lower(): column for column in columns}
+    return next((by_name[name] for name in candidates if name in by_name), None)
+
+def score_sites(scorer, sites, latitude_column='latitude', longitude_column='longitude'):
+    """sites with the district, rankings and district parameters at each site appended"""
+    latitudes = pd.to_numeric(sites[latitude_column], errors='coerce').to_numpy(dtype=float, na_value=float('nan'))
+    longitudes = pd.to_numeric(sites[longitude_column], errors='coerce').to_numpy(dtype=float, na_value=float('nan'))
+    districts = lookup_points(scorer, longitudes, latitudes).drop(columns=['longitude', 'latitude', 'district_id'])
+
+    names = {**OUTPUT_COLUMNS, **{column: name for name, column in DISTRICT_PARAMETER_MAPPING.items()}}
+    districts = districts.rename(columns=names)
+    # Keep the input's own columns as they are
+    districts = districts.rename(columns={column: f"{column} (district)" for column in districts.columns
+                                          if column in sites.columns})
+    districts.index = sites.index
+    return pd.concat([sites, districts], axis=1)
+
+def score_csv(scorer, input_path, output_path, latitude_column=None, longitude_column=None, chunk_size=CHUNK_SIZE):
+    """Stream a site CSV through score_sites in chunks; return the number of sites and of sites in a district"""
+    header = pd.read_csv(input_path, nrows=0).columns
+    latitude_column = latitude_column or find_column(header, LATITUDE_COLUMNS)
+    longitude_column = longitude_column or find_column(header, LONGITUDE_COLUMNS)
+    if latitude_column is None or longitude_column is None:
+        raise ValueError(f"{input_path} needs latitude and longitude columns (found: {', '.join(map(str, header))})")
+
+    sites_total = 0
+    sites_matched = 0
+    writer = None
+    try:
+        for chunk in pd.read_csv(input_path, chunksize=chunk_size, dtype=str, keep_default_na=False):
+            scored = score_sites(scorer, chunk, latitude_column, longitude_column)
+            table = pa.Table.from_pandas(scored, preserve_index=False)
+            if writer is None:
+                writer = pa_csv.CSVWriter(output_path, table.schema)
+            writer.write_table(table)
+            sites_total += len(scored)
+            sites_matched += int(scored[OUTPUT_COLUMNS['NAME_2']].notna().sum())
+
+        if writer is None:
+            # Header only, so the output still has every column
+            empty = pd.read_csv(input_path, nrows=0, dtype=str)
+            table = pa.Table.from_pandas(score_sites(scorer, empty, latitude_column, longitude_column), preserve_index=False)
+            pa_csv.write_csv(table, output_path)
+    finally:
+        if writer is not None:
+            writer.close()
+    return {'sites': sites_total, 'matched': sites_matched}
+
+def get_output_path(input_path):
+    """Default output path: the input's name with a _scored suffix"""
+    base_path, extension = os.path.splitext(input_path)
+    return f"{base_path}_scored{extension or '.csv'}"
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python site_scoring.py sites.csv [scored.csv] [shapefile]")
+        sys.exit(1)
+
+    input_path = sys.argv[1]
+    output_path = sys.argv[2] if len(sys.argv) > 2 else get_output_path(input_path)
+    shapefile_path = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_SHAPEFILE
+
+    print("=== Scoring Candidate Sites ===")
+    scorer = build_site_scorer(load_layer(shapefile_path))
+    try:
+        result = score_csv(scorer, input_path, output_path)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ {output_path}: {result['sites']} sites, {result['matched']} inside a district")
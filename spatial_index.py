@@ -0,0 +1,50 @@
+import numpy as np
+import shapely
+
+# STRtree over the districts for vectorized point and bounding box lookups.
+
+NAME_COLUMNS = ['NAME_1', 'NAME_2']
+RANKING_COLUMNS = ['Adapt', 'Mitigate', 'Replace', 'General_SI']
+
+def build_spatial_index(gdf, columns=NAME_COLUMNS + RANKING_COLUMNS):
+    """STRtree over gdf's geometries in EPSG:4326, with the named columns aligned to the tree"""
+    geometry = gdf.geometry
+    if geometry.crs is not None and geometry.crs.to_epsg() != 4326:
+        geometry = geometry.to_crs(epsg=4326)
+    geometries = np.asarray(geometry.values)
+    shapely.prepare(geometries)
+    attributes = gdf[[column for column in columns if column in gdf.columns]].reset_index(drop=True)
+    return {
+        'tree': shapely.STRtree(geometries),
+        'geometries': geometries,
+        'attributes': attributes,
+        'labels': gdf.index.to_numpy()
+    }
+
+def _district_rows(index, positions):
+    """Attributes of the districts at tree positions (all-NA rows where the position is -1)"""
+    rows = index['attributes'].reindex(positions)
+    rows.insert(0, 'district_id', np.where(positions >= 0, index['labels'][np.maximum(positions, 0)], None))
+    return rows.reset_index(drop=True)
+
+def lookup_points(index, longitudes, latitudes):
+    """District names and rankings at each (longitude, latitude); NA where a point is in no district"""
+    longitudes = np.asarray(longitudes, dtype=float)
+    latitudes = np.asarray(latitudes, dtype=float)
+    point_ids, district_ids = index['tree'].query(shapely.points(longitudes, latitudes))
+    hits = shapely.intersects_xy(index['geometries'][district_ids], longitudes[point_ids], latitudes[point_ids])
+    point_ids, district_ids = point_ids[hits], district_ids[hits]
+
+    positions = np.full(len(longitudes), -1, dtype=np.int64)
+    _, first = np.unique(point_ids, return_index=True)
+    positions[point_ids[first]] = district_ids[first]
+
+    rows = _district_rows(index, positions)
+    rows.insert(0, 'latitude', latitudes)
+    rows.insert(0, 'longitude', longitudes)
+    return rows
+
+def query_bbox(index, min_x, min_y, max_x, max_y):
+    """Names and rankings of every district intersecting a lon/lat bounding box"""
+    positions = index['tree'].query(shapely.box(min_x, min_y, max_x, max_y), predicate='intersects')
+    return _district_rows(index, np.sort(positions))
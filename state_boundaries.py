@@ -0,0 +1,45 @@
+from data_cleaning import normalize_name
+from map_payload import build_map_payload
+
+# State boundary overlay, serialized once for the whole country and for each state.
+
+# Columns that may hold the state name, in order of preference
+STATE_NAME_COLUMNS = ['NAME_1', 'State_Name', 'State', 'STATE', 'state', 'name', 'NAME']
+
+COUNTRY_TOLERANCE = 0.01  # Degrees, for the national/state views (zoom 4-9)
+STATE_TOLERANCE = 0.002   # Degrees, for the single-state overlay on the district map (zoom 8)
+COUNTRY_ZOOM = 6
+STATE_ZOOM = 8
+
+def find_state_name_column(boundary_gdf):
+    """Return the first known state-name column present in the boundary layer"""
+    for col in STATE_NAME_COLUMNS:
+        if col in boundary_gdf.columns:
+            return col
+    return None
+
+def build_boundary_overlay(boundary_gdf):
+    """Reproject, simplify and serialize the boundary layer for the whole country and per state"""
+    boundary_wgs = boundary_gdf.to_crs(epsg=4326)
+
+    country = boundary_wgs.copy()
+    country.geometry = country.geometry.simplify(COUNTRY_TOLERANCE, preserve_topology=True)
+
+    states = {}
+    name_column = find_state_name_column(boundary_wgs)
+    if name_column is not None:
+        detailed = boundary_wgs.copy()
+        detailed.geometry = detailed.geometry.simplify(STATE_TOLERANCE, preserve_topology=True)
+        keys = detailed[name_column].map(normalize_name)
+        for key, state_gdf in detailed.groupby(keys, sort=False):
+            states[key] = build_map_payload(state_gdf, None, STATE_ZOOM)
+
+    return {
+        'country': build_map_payload(country, None, COUNTRY_ZOOM),
+        'states': states,
+        'name_column': name_column
+    }
+
+def get_state_overlay(overlay, state_name):
+    """GeoJSON for one state's boundary, or None if the state is not in the layer"""
+    return overlay['states'].get(normalize_name(state_name))
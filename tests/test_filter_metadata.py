@@ -0,0 +1,35 @@
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import box
+
+from data_bundle import read_bundle, write_bundle
+from filter_metadata import build_filter_metadata
+
+def _layer():
+    return gpd.GeoDataFrame({
+        'NAME_1': ['Bihar', 'Bihar', None],
+        'NAME_2': ['Arwal', None, 'Unnamed'],
+        'Adapt': [1.0, 2.0, None]
+    }, geometry=[box(84, 25, 85, 26), box(85, 25, 86, 26), box(86, 25, 87, 26)], crs='EPSG:4326')
+
+def test_zero_copy_bundle_matches_normal_read(tmp_path):
+    bundle_path = str(tmp_path / 'layer.arrow')
+    write_bundle(_layer(), bundle_path, 'hash')
+
+    normal = build_filter_metadata(read_bundle(bundle_path))
+    zero_copy = build_filter_metadata(read_bundle(bundle_path, zero_copy=True))
+
+    assert zero_copy == normal
+    assert zero_copy['states'] == ['Bihar']
+    assert zero_copy['districts']['All States'] == ['Arwal', 'Unnamed']
+    assert '<NA>' not in zero_copy['frames']
+
+def test_zero_copy_keeps_name_columns_plain(tmp_path):
+    bundle_path = str(tmp_path / 'layer.arrow')
+    write_bundle(_layer(), bundle_path, 'hash')
+
+    normal = read_bundle(bundle_path)
+    gdf = read_bundle(bundle_path, zero_copy=True)
+    for column in ['NAME_1', 'NAME_2']:
+        pd.testing.assert_series_equal(gdf[column], normal[column])
+    assert isinstance(gdf['Adapt'].dtype, pd.ArrowDtype)
@@ -0,0 +1,38 @@
+import geopandas as gpd
+import shapely
+from shapely.geometry import Polygon
+
+from geometry_pyramid import build_geometry_pyramid, coverage_problem, simplify_coverage
+
+def _wavy_square(x0, x1):
+    # A square whose left and right edges carry small zig-zags, so simplification has work to do
+    left = [(x0 + 0.001 * (i % 2), y / 10) for y, i in zip(range(10, -1, -1), range(11))]
+    right = [(x1 + 0.001 * (i % 2), y / 10) for y, i in zip(range(11), range(11))]
+    return Polygon(right + left)
+
+def _neighbours():
+    # Two districts sharing an edge exactly: a valid coverage
+    return shapely.normalize(shapely.polygons([_wavy_square(0, 1).exterior.coords, _wavy_square(1, 2).exterior.coords]))
+
+def test_valid_coverage_is_simplified_together(capsys):
+    geometries = _neighbours()
+    assert coverage_problem(geometries) is None
+
+    simplified = simplify_coverage(geometries, 0.01)
+    assert capsys.readouterr().out == ''
+    assert shapely.coverage_is_valid(simplified)
+
+def test_invalid_coverage_falls_back_with_a_warning(capsys):
+    # Overlapping districts aren't a coverage
+    geometries = shapely.box([0, 0.5], [0, 0], [1, 1.5], [1, 1])
+    assert coverage_problem(geometries) is not None
+
+    simplified = simplify_coverage(geometries, 0.01)
+    assert '⚠️' in capsys.readouterr().out
+    assert all(shapely.equals(simplified, shapely.simplify(geometries, 0.01, preserve_topology=True)))
+
+def test_pyramid_warns_once(capsys):
+    gdf = gpd.GeoDataFrame(geometry=shapely.box([0, 0.5], [0, 0], [1, 1.5], [1, 1]), crs='EPSG:4326')
+    pyramid = build_geometry_pyramid(gdf)
+    assert capsys.readouterr().out.count('⚠️') == 1
+    assert sorted(pyramid) == [4, 6, 7, 8, 9]
@@ -0,0 +1,55 @@
+import pandas as pd
+
+from data_cleaning import normalize_name
+
+# District narratives keyed by normalized (state, district); the text CSV has no
+# State column, so states come from District_Param_Values.csv, which it follows row for row.
+
+TEXT_FIELDS = ['Text-Crop', 'Text-Water', 'Text-Energy', 'Text-Farmer', 'Text-Utilty', 'Text-Model']
+
+def _row_states(text_data, state_source_path):
+    """State for each text row, from the parameter table that lists districts in the same order"""
+    try:
+        source = pd.read_csv(state_source_path, usecols=['State', 'District'], dtype=str)
+    except (OSError, ValueError):
+        return [None] * len(text_data)
+
+    if len(source) != len(text_data):
+        return [None] * len(text_data)
+    if not (source['District'].fillna('').map(normalize_name) == text_data['District'].fillna('').map(normalize_name)).all():
+        return [None] * len(text_data)
+    return source['State'].tolist()
+
+def build_text_store(text_path='district_text_data.csv', state_source_path='District_Param_Values.csv'):
+    """Parse the narrative CSV into {(state_key, district_key): {field: text}}"""
+    text_data = pd.read_csv(text_path, dtype=str)
+    fields = [field for field in TEXT_FIELDS if field in text_data.columns]
+    states = _row_states(text_data, state_source_path)
+
+    store = {}
+    by_district = {}
+    for state, row in zip(states, text_data[['District'] + fields].itertuples(index=False, name=None)):
+        district, values = row[0], row[1:]
+        if pd.isna(district):
+            continue
+        texts = {field: value for field, value in zip(fields, values) if not pd.isna(value)}
+        district_key = normalize_name(district)
+        if not pd.isna(state):
+            # First row wins, as the old .iloc[0] lookup did
+            store.setdefault((normalize_name(state), district_key), texts)
+        by_district.setdefault(district_key, []).append(texts)
+
+    # District-only keys for names that occur once, used when the state doesn't match
+    for district_key, matches in by_district.items():
+        if len(matches) == 1:
+            store.setdefault((None, district_key), matches[0])
+
+    return store
+
+def get_district_text(store, state_name, district_name):
+    """Text-* fields for one district, or an empty dict"""
+    district_key = normalize_name(district_name)
+    texts = store.get((normalize_name(state_name), district_key))
+    if texts is None:
+        texts = store.get((None, district_key), {})
+    return texts
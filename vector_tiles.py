@@ -0,0 +1,195 @@
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+import pandas as pd
+import shapely
+
+from geometry_pyramid import select_level
+
+# Mapbox Vector Tile (MVT) server for the map layers, on a daemon thread in the
+# Streamlit process; on only when SOLAR_TILE_URL says where the browser reaches it.
+
+try:
+    import mapbox_vector_tile
+except ImportError:
+    mapbox_vector_tile = None
+
+WEB_MERCATOR_EXTENT = 20037508.342789244
+TILE_EXTENT = 4096
+TILE_BUFFER = 64  # Tile units of overlap so strokes don't break at tile edges
+MIN_ZOOM = 0
+MAX_ZOOM = 14
+TILE_CACHE_SIZE = 4096
+
+# Tile URLs carry the layer's data version, so tiles can be cached long
+TILE_CACHE_CONTROL = 'public, max-age=86400'
+
+DEFAULT_TILE_PORT = int(os.environ.get('SOLAR_TILE_PORT', '8765'))
+DEFAULT_TILE_HOST = os.environ.get('SOLAR_TILE_HOST', '127.0.0.1')
+# Public URL of the server (e.g. a path the app's reverse proxy forwards to it)
+TILE_URL = os.environ.get('SOLAR_TILE_URL')
+# Origin allowed to fetch tiles cross-origin (the app's), when TILE_URL is on another origin
+TILE_ALLOW_ORIGIN = os.environ.get('SOLAR_TILE_ALLOW_ORIGIN')
+
+_layers = {}
+_layers_lock = threading.Lock()
+_tiles = OrderedDict()
+_tiles_lock = threading.Lock()
+_server = None
+
+def is_available():
+    """Vector tiles need the optional mapbox-vector-tile encoder and a configured SOLAR_TILE_URL"""
+    return mapbox_vector_tile is not None and bool(TILE_URL)
+
+def tile_bounds(z, x, y):
+    """Web Mercator bounds (minx, miny, maxx, maxy) of an XYZ tile"""
+    tile_size = 2 * WEB_MERCATOR_EXTENT / (2 ** z)
+    minx = -WEB_MERCATOR_EXTENT + x * tile_size
+    maxy = WEB_MERCATOR_EXTENT - y * tile_size
+    return minx, maxy - tile_size, minx + tile_size, maxy
+
+def simplify_tolerance(z):
+    """Simplification tolerance (metres) matching one tile unit at zoom z"""
+    return 2 * WEB_MERCATOR_EXTENT / (2 ** z) / TILE_EXTENT
+
+def register_layer(name, gdf, property_columns, version, filter_column=None, pyramid=None):
+    """Reproject, index and publish a GeoDataFrame (and optional geometry pyramid) as a tile layer of a data version"""
+    gdf_mercator = gdf.to_crs(epsg=3857)
+    geometries = gdf_mercator.geometry.to_numpy()
+
+    levels = None
+    if pyramid is not None:
+        levels = {zoom: level.to_crs(epsg=3857).to_numpy() for zoom, level in pyramid.items()}
+
+    columns = [col for col in property_columns if col in gdf.columns]
+    properties = []
+    for position, row in enumerate(gdf[columns].itertuples(index=False, name=None)):
+        feature_properties = {'id': position}
+        for col, value in zip(columns, row):
+            if not pd.isna(value):
+                feature_properties[col] = str(value)
+        properties.append(feature_properties)
+
+    filter_values = None
+    if filter_column is not None and filter_column in gdf.columns:
+        filter_values = gdf[filter_column].astype(str).to_numpy()
+
+    layer = {
+        'geometries': geometries,
+        'tree': shapely.STRtree(geometries),
+        'properties': properties,
+        'filter_values': filter_values,
+        'levels': levels,
+        'version': str(version)
+    }
+    with _layers_lock:
+        _layers[name] = layer
+
+def render_tile(name, version, z, x, y, filter_value=None):
+    """Encoded MVT bytes for one tile of a registered layer, or None unless version is the one registered"""
+    with _layers_lock:
+        layer = _layers.get(name)
+    if layer is None or layer['version'] != version:
+        return None
+
+    key = (name, version, z, x, y, filter_value)
+    with _tiles_lock:
+        tile = _tiles.get(key)
+        if tile is not None:
+            _tiles.move_to_end(key)
+            return tile
+
+    # Rendered from the layer snapshot taken above, even if a new version is registered meanwhile
+    tile = _encode_tile(name, layer, z, x, y, filter_value)
+    with _tiles_lock:
+        _tiles[key] = tile
+        while len(_tiles) > TILE_CACHE_SIZE:
+            _tiles.popitem(last=False)
+    return tile
+
+def _encode_tile(name, layer, z, x, y, filter_value):
+    minx, miny, maxx, maxy = tile_bounds(z, x, y)
+    buffer = (maxx - minx) * TILE_BUFFER / TILE_EXTENT
+    query_box = shapely.box(minx - buffer, miny - buffer, maxx + buffer, maxy + buffer)
+
+    candidates = layer['tree'].query(query_box, predicate='intersects')
+    if filter_value is not None and layer['filter_values'] is not None:
+        candidates = candidates[layer['filter_values'][candidates] == filter_value]
+
+    features = []
+    if len(candidates) > 0:
+        if layer['levels'] is not None:
+            # Pyramid levels are already simplified with shared borders intact
+            simplified = shapely.clip_by_rect(
+                select_level(layer['levels'], z)[candidates],
+                minx - buffer, miny - buffer, maxx + buffer, maxy + buffer
+            )
+        else:
+            clipped = shapely.clip_by_rect(
+                layer['geometries'][candidates],
+                minx - buffer, miny - buffer, maxx + buffer, maxy + buffer
+            )
+            simplified = shapely.simplify(clipped, simplify_tolerance(z), preserve_topology=True)
+        for position, geometry in zip(candidates, simplified):
+            if geometry is None or geometry.is_empty:
+                continue
+            features.append({'geometry': geometry, 'properties': layer['properties'][position]})
+
+    return mapbox_vector_tile.encode(
+        [{'name': name, 'features': features}],
+        default_options={'quantize_bounds': (minx, miny, maxx, maxy), 'extents': TILE_EXTENT}
+    )
+
+class _TileRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        parts = parsed.path.strip('/').split('/')
+
+        # Expected: /tiles/<layer>/<version>/<z>/<x>/<y>.pbf[?filter=<value>]
+        try:
+            if len(parts) != 6 or parts[0] != 'tiles' or not parts[5].endswith('.pbf'):
+                raise ValueError
+            z, x, y = int(parts[3]), int(parts[4]), int(parts[5][:-len('.pbf')])
+            if not (MIN_ZOOM <= z <= MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+                raise ValueError
+        except ValueError:
+            self.send_error(404)
+            return
+
+        filter_value = parse_qs(parsed.query).get('filter', [None])[0]
+        tile = render_tile(parts[1], unquote(parts[2]), z, x, y, filter_value)
+        if tile is None:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/vnd.mapbox-vector-tile')
+        self.send_header('Content-Length', str(len(tile)))
+        if TILE_ALLOW_ORIGIN:
+            self.send_header('Access-Control-Allow-Origin', TILE_ALLOW_ORIGIN)
+            self.send_header('Vary', 'Origin')
+        self.send_header('Cache-Control', TILE_CACHE_CONTROL)
+        self.end_headers()
+        self.wfile.write(tile)
+
+    def log_message(self, format, *args):
+        # Keep tile requests out of the Streamlit console
+        pass
+
+def start_tile_server(port=DEFAULT_TILE_PORT, host=DEFAULT_TILE_HOST):
+    """Start the tile server on a daemon thread (once per process) and return its public base URL (SOLAR_TILE_URL)"""
+    global _server
+    if _server is None:
+        _server = ThreadingHTTPServer((host, port), _TileRequestHandler)
+        threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return TILE_URL.rstrip('/') if TILE_URL else None
+
+def get_tile_url(base_url, name, version, filter_value=None):
+    """Leaflet URL template for a data version of a registered layer"""
+    url = f"{base_url}/tiles/{name}/{quote(str(version), safe='')}/{{z}}/{{x}}/{{y}}.pbf"
+    if filter_value is not None:
+        url += f"?filter={quote(str(filter_value))}"
+    return url
@@ -0,0 +1,134 @@
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import geopandas as gpd
+import pyarrow as pa
+
+from aggregates import ALL_STATES, summarize_category
+from data_bundle import compute_source_hash, load_bundle, load_layer_pyramid, simplify_layer
+from data_cleaning import normalize_missing_values
+from geometry_pyramid import select_level
+from map_payload import build_class_codes, build_map_payload, mapped_rows, view_zoom_level
+
+# Pre-renders every (state, objective) view into an Arrow file next to the shapefile.
+#
+#   python warmup.py [shapefile]
+
+VIEW_STORE_EXTENSION = '.views.arrow'
+VIEW_STORE_METADATA_KEY = b'solar_views'
+VIEW_STORE_FORMAT_VERSION = 3
+
+OBJECTIVES = ['Adapt', 'Mitigate', 'Replace', 'General_SI']
+
+_worker_layer = None
+
+def get_view_store_path(shapefile_path):
+    """Return the view store path that belongs to a shapefile"""
+    return os.path.splitext(shapefile_path)[0] + VIEW_STORE_EXTENSION
+
+def load_layer(shapefile_path):
+    """The district layer exactly as the dashboard loads it (bundle first, else parse and simplify)"""
+    gdf = load_bundle(shapefile_path)
+    if gdf is None:
+        os.environ['SHAPE_RESTORE_SHX'] = 'YES'
+        gdf, _ = simplify_layer(normalize_missing_values(gpd.read_file(shapefile_path)))
+    return gdf
+
+def _init_worker(shapefile_path):
+    global _worker_layer
+    gdf = load_layer(shapefile_path)
+    pyramid = {zoom: level.set_axis(gdf.index) for zoom, level in load_layer_pyramid(shapefile_path).items()}
+    _worker_layer = (gdf, pyramid)
+
+def build_view(state, objectives):
+    """Map payload and statistics for one state (or All States) and each objective"""
+    gdf, pyramid = _worker_layer
+    view_gdf = gdf if state == ALL_STATES else gdf[gdf['NAME_1'] == state]
+    zoom = view_zoom_level(view_gdf.geometry.total_bounds, state == ALL_STATES)
+    geometries = select_level(pyramid, zoom).loc[view_gdf.index]
+
+    # One geometry payload and one set of class codes per state serve every objective
+    payload = build_map_payload(view_gdf, None, zoom, geometries)
+    class_codes = json.dumps(build_class_codes(view_gdf, objectives, mapped_rows(geometries)))
+    views = []
+    for objective in objectives:
+        statistics = summarize_category(view_gdf[objective]) if objective in view_gdf.columns else None
+        views.append((state, objective, zoom, payload, class_codes, json.dumps(statistics)))
+    return views
+
+def build_view_store(shapefile_path, objectives=OBJECTIVES, max_workers=None):
+    """Pre-render every (state, objective) view on a process pool and write the view store"""
+    states = [ALL_STATES] + sorted(load_layer(shapefile_path)['NAME_1'].dropna().astype(str).unique())
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(shapefile_path,)) as pool:
+        results = pool.map(build_view, states, [objectives] * len(states))
+        views = [view for state_views in results for view in state_views]
+
+    columns = list(zip(*views))
+    table = pa.table({
+        'state': pa.array(columns[0], pa.string()),
+        'objective': pa.array(columns[1], pa.string()),
+        'zoom': pa.array(columns[2], pa.int8()),
+        # Dictionary-encoded, so each state's payload is stored once for all its objectives
+        'payload': pa.array(columns[3], pa.large_string()).dictionary_encode(),
+        'class_codes': pa.array(columns[4], pa.string()).dictionary_encode(),
+        'statistics': pa.array(columns[5], pa.string())
+    })
+    store_info = {
+        'format_version': VIEW_STORE_FORMAT_VERSION,
+        'source_hash': compute_source_hash(shapefile_path),
+        'views': len(views)
+    }
+    table = table.replace_schema_metadata({VIEW_STORE_METADATA_KEY: json.dumps(store_info).encode()})
+
+    # Write to a temporary file first so readers never see a half-written store
+    store_path = get_view_store_path(shapefile_path)
+    tmp_path = store_path + '.tmp'
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, store_path)
+
+    return store_info
+
+def load_view_store(shapefile_path):
+    """{(state, objective): {'zoom', 'payload', 'class_codes', 'statistics'}}, or None if missing or stale"""
+    store_path = get_view_store_path(shapefile_path)
+    if not os.path.exists(store_path):
+        return None
+    try:
+        with pa.memory_map(store_path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+    except (pa.ArrowInvalid, OSError):
+        return None
+
+    store_info = json.loads((table.schema.metadata or {}).get(VIEW_STORE_METADATA_KEY, b'{}'))
+    if store_info.get('format_version') != VIEW_STORE_FORMAT_VERSION:
+        return None
+    source_hash = compute_source_hash(shapefile_path)
+    if source_hash is not None and source_hash != store_info.get('source_hash'):
+        return None
+
+    views = {}
+    payloads = {}
+    class_codes = {}
+    for row in table.to_pylist():
+        if row['class_codes'] not in class_codes:
+            class_codes[row['class_codes']] = json.loads(row['class_codes'])
+        views[(row['state'], row['objective'])] = {
+            'zoom': row['zoom'],
+            # Objectives of a state share one payload string and one set of class codes
+            'payload': payloads.setdefault(row['payload'], row['payload']),
+            'class_codes': class_codes[row['class_codes']],
+            'statistics': json.loads(row['statistics'])
+        }
+    return views
+
+if __name__ == "__main__":
+    shapefile_path = sys.argv[1] if len(sys.argv) > 1 else 'Shapefiles/true_solar_suitability_with_data.shp'
+
+    print("=== Warming Up Dashboard Views ===")
+    info = build_view_store(shapefile_path)
+    print(f"✅ {get_view_store_path(shapefile_path)}: {info['views']} views")
@@ -0,0 +1,117 @@
+import os
+import sys
+
+import pandas as pd
+
+# Streaming ingest of the source tables straight from the Excel workbook,
+# keeping only the columns the build needs.
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+WORKBOOK_PATH = 'Solar_Suitability_workbook 5.xlsx'
+
+# CSV export -> workbook sheet it was exported from
+SOURCE_SHEETS = {
+    'District_Param_Values.csv': 'District_recommendation',
+    'Country_State_Param_Values.csv': 'Adaptation',
+    'Solar_new_ranking.csv': 'Solar Suitability_new_ranking'
+}
+
+# ColNames mapping file that lists the columns needed from each source (None = every column)
+SOURCE_COLNAMES = {
+    'District_Param_Values.csv': 'District_ColNames.csv',
+    'Country_State_Param_Values.csv': 'Country_State_ColNames.csv',
+    'Solar_new_ranking.csv': None
+}
+
+KEY_COLUMNS = ['State', 'District']
+
+# Cell strings read_csv treats as missing, so a sheet loads like its CSV export
+CSV_NA_STRINGS = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+}
+
+# Cached results of formulas that failed in Excel
+EXCEL_ERROR_STRINGS = {'#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#NULL!', '#N/A'}
+
+MISSING_CELL_STRINGS = CSV_NA_STRINGS | EXCEL_ERROR_STRINGS
+
+def use_workbook(workbook_path=WORKBOOK_PATH, argv=None):
+    """Read from the workbook unless it (or openpyxl) is missing or --csv was given"""
+    argv = sys.argv if argv is None else argv
+    return openpyxl is not None and os.path.exists(workbook_path) and '--csv' not in argv
+
+def source_files(csv_names, from_workbook, workbook_path=WORKBOOK_PATH):
+    """Files the given source tables are actually read from, for build fingerprints"""
+    return [workbook_path] if from_workbook else list(csv_names)
+
+def wanted_columns(colnames_path):
+    """Key columns plus every source column listed in a ColNames mapping file"""
+    if colnames_path is None or not os.path.exists(colnames_path):
+        return None
+    listed = pd.read_csv(colnames_path)['Column'].dropna().astype(str).tolist()
+    return list(dict.fromkeys(KEY_COLUMNS + listed))
+
+def read_cell(value):
+    """A cell value as the CSV export would load it: sentinels and errors missing, whole floats as int"""
+    if isinstance(value, str) and value.strip() in MISSING_CELL_STRINGS:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        # Excel exports 3.0 as '3', and the zero rule in clean_column depends on it
+        return int(value)
+    return value
+
+def read_sheet(worksheet, columns=None):
+    """Stream a worksheet into a DataFrame holding the first occurrence of each wanted column"""
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, ())
+
+    # The table header ends at the first blank cell (helper columns follow some sheets)
+    positions = {}
+    repeated = {}
+    for position, name in enumerate(header):
+        if name is None:
+            break
+        if name in positions:
+            repeated.setdefault(name, [positions[name]]).append(position)
+        else:
+            positions[name] = position
+
+    names = list(positions) if columns is None else [col for col in columns if col in positions]
+    for name in names:
+        if name in repeated:
+            print(f"  ⚠️  '{name}' appears {len(repeated[name])} times in {worksheet.title}; "
+                  f"using column {repeated[name][0] + 1}")
+
+    indices = [positions[name] for name in names]
+    records = []
+    for row in rows:
+        cells = [read_cell(row[index]) if index < len(row) else None for index in indices]
+        # Skip rows that are blank (or only hold sentinels) in the table's columns
+        if all(cell is None for cell in cells):
+            continue
+        records.append(cells)
+
+    # object columns keep each cell's own type (0 stays 0 next to 3.5), as CSV text would
+    return pd.DataFrame(records, columns=names, dtype=object)
+
+def load_source_tables(workbook_path=WORKBOOK_PATH):
+    """{csv name: DataFrame} for every source table, read from the workbook in one streaming pass"""
+    workbook = openpyxl.load_workbook(workbook_path, read_only=True, data_only=True)
+    try:
+        tables = {}
+        for csv_name, sheet_name in SOURCE_SHEETS.items():
+            tables[csv_name] = read_sheet(workbook[sheet_name], wanted_columns(SOURCE_COLNAMES[csv_name]))
+        return tables
+    finally:
+        workbook.close()
+
+def load_source(csv_name, tables=None):
+    """One source table: from preloaded workbook tables when given, else from its CSV export"""
+    if tables is not None:
+        return tables[csv_name].copy()
+    return pd.read_csv(csv_name)